@@ -9,10 +9,15 @@ ACE Pro Unit Driver for AFC
 Implements AFC unit interface for ACE Pro hardware
 """
 
+import os
+import time
+import threading
+import concurrent.futures
 import traceback
 import logging
 from configparser import Error as error
 from datetime import datetime
+from types import MappingProxyType
 
 try: from extras.AFC_utils import ERROR_STR
 except: raise error("Error when trying to import AFC_utils.ERROR_STR\n{trace}".format(trace=traceback.format_exc()))
@@ -23,12 +28,52 @@ except: raise error(ERROR_STR.format(import_lib="AFC_lane", trace=traceback.form
 try: from extras.AFC_unit import afcUnit
 except: raise error(ERROR_STR.format(import_lib="AFC_unit", trace=traceback.format_exc()))
 
-try: from extras.AFC_ACE_protocol import AceProtocol
+try: from extras.AFC_ACE_protocol import AceProtocol, LANES_PER_ACE, REQUEST_TIMEOUT
 except: raise error(ERROR_STR.format(import_lib="AFC_ACE_protocol", trace=traceback.format_exc()))
 
 try: from extras.AFC_ACE_discovery import AceDiscovery
 except: raise error(ERROR_STR.format(import_lib="AFC_ACE_discovery", trace=traceback.format_exc()))
 
+# Time after which a wait for the I/O thread is logged as slow; a queued
+# call may sit behind another command that uses its full REQUEST_TIMEOUT
+IO_TIMEOUT = 2 * REQUEST_TIMEOUT + 1.0
+
+# Re-send feed assist state after this many seconds even if unchanged,
+# in case the ACE lost it (e.g. brownout)
+ASSIST_RESYNC_INTERVAL = 30.0
+
+# Delays before each attempt to read the initial status after connecting
+INITIAL_STATUS_BACKOFF = (0.0, 0.02, 0.05, 0.1)
+
+# Background status polling interval in seconds (~5 Hz)
+STATUS_POLL_INTERVAL = 0.2
+
+# After a failed request, skip further I/O for this long (seconds) while
+# the poller probes the device with get_info
+OFFLINE_BACKOFF = 2.0
+
+# system_Test status messages
+_MSG_EMPTY = 'EMPTY READY FOR SPOOL'
+_MSG_LOADED = "<span class=success--text>LOCKED AND LOADED</span>"
+_MSG_IN_TOOLHEAD = "<span class=primary--text> in ToolHead</span>"
+_MSG_ERROR = "<span class=error--text>SLOT ERROR</span>"
+_MSG_TEST_ERROR = "<span class=error--text>TEST ERROR</span>"
+_MSG_COMM = "<span class=warning--text>UNKNOWN (Communication Error)</span>"
+_MSG_UNKNOWN_FMT = "<span class=warning--text>UNKNOWN STATUS: %s</span>"
+
+
+class _MockHub:
+    """Stand-in hub for ACE units, which manage filament internally"""
+
+    __slots__ = ('state', 'name', 'lanes', 'move_dis', 'load_length')
+
+    def __init__(self):
+        self.state = True     # Always "triggered" - ACE manages filament internally
+        self.name = None      # No actual hub name
+        self.lanes = {}       # Lanes will register here instead of real hub
+        self.move_dis = 0     # Hub move distance (not used for ACE)
+        self.load_length = 0  # Hub load length (not used for ACE)
+
 
 class afcACE(afcUnit):
     """
@@ -38,6 +83,25 @@ class afcACE(afcUnit):
     Each ACE device provides 4 lanes (slots).
     """
 
+    # ASCII art logos for AFC, formatted with the unit name in handle_connect()
+    _LOGO_TMPL = ('<span class=success--text> ___   _____  _____\n'
+                  'A   | |     || |   \n'
+                  'C---| | |---|| |---\n'
+                  'E   | |_____||_____|\n'
+                  '  {name}\n')
+
+    _LOGO_ERROR_TMPL = ('<span class=error--text>E  _ _   _ _\n'
+                        'R |_|_|_|_|_|\n'
+                        'R |   ACE    |\n'
+                        'O |   ERROR  |\n'
+                        'R |  <span class=secondary--text>X</span>       |\n'
+                        '! |_________|\n'
+                        '  {name}\n')
+
+    # Feed/retract speed limits accepted by the ACE
+    _SPEED_MIN = 10
+    _SPEED_MAX = 80
+
     def __init__(self, config):
         """
         Initialize ACE unit.
@@ -55,21 +119,19 @@ class afcACE(afcUnit):
         # Create mock hub object to prevent lanes from auto-assigning to other hubs
         # AFC lanes check unit.hub_obj and auto-assign to first available hub if None
         # ACE manages filament internally, so hub operations are not needed
-        class MockHub:
-            def __init__(self):
-                self.state = True     # Always "triggered" - ACE manages filament internally
-                self.name = None      # No actual hub name
-                self.lanes = {}       # Lanes will register here instead of real hub
-                self.move_dis = 0     # Hub move distance (not used for ACE)
-                self.load_length = 0  # Hub load length (not used for ACE)
-
-        self.hub_obj = MockHub()
+        self.hub_obj = _MockHub()
 
         # ACE-specific configuration
         self.serial = config.get('serial', None)
         self.auto_detect = config.getboolean('auto_detect', False)
         self.device_index = config.getint('device_index', 0)
         self.baud = config.getint('baud', 115200)
+        self.low_latency = config.getboolean('low_latency', os.name == 'posix')
+        self.batch_moves = config.getboolean('batch_moves', False)
+        self.match_response_id = config.getboolean('match_response_id', False)
+
+        self.printer = config.get_printer()
+        self.reactor = self.printer.get_reactor()
 
         # ACE protocol handler
         self.protocol = None
@@ -78,13 +140,52 @@ class afcACE(afcUnit):
 
         # Lane to ACE slot mapping (AFC lane → ACE slot index)
         # ACE has 4 slots (0-3), each becomes a lane in AFC
-        self.lane_to_slot = {}  # {lane_name: slot_index}
+        # Published as a read-only snapshot so readers never need a lock;
+        # _build_lane_mapping() swaps in a new one under _lane_map_lock
+        self.lane_to_slot = MappingProxyType({})  # {lane_name: slot_index}
+        self._lane_map_lock = threading.Lock()
+
+        # Set in _connect_ace once firmware has been checked for pipelined requests
+        self.multi_command = False
 
         # Status tracking
         self.last_status = None
         self.connected = False
 
-        logging.info(f"AFC_ACE: Initialized unit '{self.name}'")
+        # Serial I/O runs on a dedicated thread so USB round-trips don't stall
+        # the Klipper reactor. A single worker keeps commands in order.
+        self._io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ace-io")
+        self.printer.register_event_handler("klippy:disconnect", self.handle_disconnect)
+
+        # Short-lived get_status() cache so per-lane queries during PREP/status
+        # refresh share a single USB round-trip
+        self._status_cache = None
+        self._status_cache_ts = 0.0
+        self._status_ttl = 0.15
+        # Bumped on invalidation so polls issued before a move are discarded
+        self._status_generation = 0
+        # Completion of the on-demand status refresh currently in flight
+        self._status_inflight = None
+
+        # Background status poller, started once the ACE is connected
+        self._status_timer = None
+        self._status_poll_pending = None
+        # (generation, completion) of the last queued get_status poll, so an
+        # on-demand refresh can wait for it instead of sending its own
+        self._status_poll_shared = None
+
+        # I/O is short-circuited until this time after a failed request
+        self._offline_until = 0.0
+
+        # Last feed assist state sent per slot (None = unknown)
+        self._assist_state = [None] * LANES_PER_ACE
+        self._assist_state_ts = [0.0] * LANES_PER_ACE
+
+        # Per-slot status strings derived from the cached status
+        self._slot_states = None
+        self._slot_states_src = None
+
+        logging.info("AFC_ACE: Initialized unit '%s'", self.name)
 
     def handle_connect(self):
         """
@@ -94,32 +195,159 @@ class afcACE(afcUnit):
         super().handle_connect()
 
         # Set up ASCII art logo for AFC
-        self.logo = '<span class=success--text> ___   _____  _____\n'
-        self.logo += 'A   | |     || |   \n'
-        self.logo += 'C---| | |---|| |---\n'
-        self.logo += 'E   | |_____||_____|\n'
-        self.logo += '  ' + self.name + '\n'
-
-        self.logo_error = '<span class=error--text>E  _ _   _ _\n'
-        self.logo_error += 'R |_|_|_|_|_|\n'
-        self.logo_error += 'R |   ACE    |\n'
-        self.logo_error += 'O |   ERROR  |\n'
-        self.logo_error += 'R |  <span class=secondary--text>X</span>       |\n'
-        self.logo_error += '! |_________|\n'
-        self.logo_error += '  ' + self.name + '\n'
+        self.logo = self._LOGO_TMPL.format(name=self.name)
+        self.logo_error = self._LOGO_ERROR_TMPL.format(name=self.name)
 
         # Connect to ACE device
         self._connect_ace()
 
+        # Keep the status cache fresh in the background so system_Test and
+        # get_lane_status normally don't need any I/O of their own
+        self._status_ttl = 2 * STATUS_POLL_INTERVAL
+        self._status_timer = self.reactor.register_timer(self._poll_status, self.reactor.NOW)
+
         # Note: Lane mapping is built lazily in get_slot_for_lane()
         # because lanes aren't registered to the unit until after handle_connect()
 
+    def handle_disconnect(self):
+        """
+        Handle the disconnect event.
+        Called when Klipper shuts down or restarts.
+        """
+        if self._status_timer is not None:
+            self.reactor.unregister_timer(self._status_timer)
+            self._status_timer = None
+
+        # Let queued jobs finish (each request is bounded by REQUEST_TIMEOUT)
+        # so the port isn't closed under a command that is still running
+        self._io_executor.shutdown(wait=True)
+
+        if self.protocol:
+            self.protocol.disconnect()
+        self.connected = False
+
+    def _is_offline(self) -> bool:
+        """Check whether I/O is being skipped after a recent failure"""
+        return time.monotonic() < self._offline_until
+
+    def _mark_offline(self):
+        """Skip I/O for OFFLINE_BACKOFF seconds after a failed request"""
+        if not self._is_offline():
+            logging.warning("AFC_ACE: %s not responding, pausing I/O for %ss", self.name, OFFLINE_BACKOFF)
+        self._offline_until = time.monotonic() + OFFLINE_BACKOFF
+
+    def _io_call(self, func, *args, timeout: float = IO_TIMEOUT, ignore_offline: bool = False):
+        """
+        Run a protocol call on the I/O thread and wait for it from the reactor.
+
+        The wait yields to the reactor, so timers keep running while the
+        USB round-trip is in flight. While the unit is offline the call is
+        skipped, and a failed call marks the unit offline.
+
+        Args:
+            func: Protocol method to call
+            *args: Arguments for func
+            timeout: Time in seconds after which the wait is logged as slow
+            ignore_offline: Make the call even if the unit is marked offline
+
+        Returns:
+            Return value of func, or None while offline
+        """
+        if not ignore_offline and self._is_offline():
+            return None
+
+        return self._io_wait(self._io_start(func, *args), func.__name__, timeout)
+
+    def _io_start(self, func, *args):
+        """
+        Queue a protocol call on the I/O thread.
+
+        Args:
+            func: Protocol method to call
+            *args: Arguments for func
+
+        Returns:
+            Reactor completion that receives a (result, exception) tuple
+        """
+        completion = self.reactor.completion()
+
+        def run():
+            try:
+                outcome = (func(*args), None)
+            except Exception as e:
+                outcome = (None, e)
+            self.reactor.async_complete(completion, outcome)
+
+        self._io_executor.submit(run)
+        return completion
+
+    def _io_wait(self, completion, name: str, timeout: float = IO_TIMEOUT):
+        """
+        Wait from the reactor for a call queued by _io_start().
+
+        Several greenlets may wait on the same completion. A call that is
+        still queued or running after timeout is waited for until it ends,
+        since the ACE may still carry it out; every request it makes is
+        bounded by its own REQUEST_TIMEOUT.
+
+        Args:
+            completion: Completion returned by _io_start()
+            name: Call name used in log messages
+            timeout: Time in seconds after which the wait is logged as slow
+
+        Returns:
+            Return value of the call
+        """
+        outcome = completion.wait(self.reactor.monotonic() + timeout)
+
+        if outcome is None:
+            logging.warning("AFC_ACE: %s still running after %ss, waiting for it to finish", name, timeout)
+            outcome = completion.wait()
+
+        result, exc = outcome
+        if exc is not None:
+            self._mark_offline()
+            raise exc
+        if result is None:
+            self._mark_offline()
+        return result
+
+    def _io_submit(self, func, *args, description: str = ''):
+        """
+        Queue a protocol call on the I/O thread without waiting for it.
+
+        Failures are logged from the I/O thread.
+
+        Args:
+            func: Protocol method to call
+            *args: Arguments for func
+            description: Short description used in log messages
+
+        Returns:
+            concurrent.futures.Future for the call, or None while offline
+        """
+        if self._is_offline():
+            logging.debug("AFC_ACE: Skipping %s, unit offline", description or func.__name__)
+            return None
+
+        def done(future):
+            try:
+                if not future.result():
+                    logging.warning("AFC_ACE: Failed to %s", description or func.__name__)
+            except Exception as e:
+                logging.error("AFC_ACE: Error during %s: %s", description or func.__name__, e)
+
+        future = self._io_executor.submit(func, *args)
+        future.add_done_callback(done)
+        return future
+
     def _connect_ace(self):
         """Connect to ACE Pro device via USB"""
         try:
             # Auto-detect or use configured serial port
             if self.auto_detect:
-                logging.info(f"AFC_ACE: Auto-detecting ACE devices...")
+                logging.info("AFC_ACE: Auto-detecting ACE devices...")
+                # Scans are cached and shared by all auto-detected units
                 devices = AceDiscovery.find_ace_devices()
 
                 if not devices:
@@ -132,14 +360,15 @@ class afcACE(afcUnit):
                 self.serial = device['port']
                 self.device_id = device['device_id']
 
-                logging.info(f"AFC_ACE: Auto-detected device {self.device_index}: {self.serial} (ID: {self.device_id})")
+                logging.info("AFC_ACE: Auto-detected device %s: %s (ID: %s)", self.device_index, self.serial, self.device_id)
 
             # Validate serial port
             if not self.serial:
                 raise error(f"AFC_ACE: No serial port configured for unit '{self.name}'. Set 'serial' or enable 'auto_detect'")
 
             # Create protocol handler
-            self.protocol = AceProtocol(self.serial, self.baud)
+            self.protocol = AceProtocol(self.serial, self.baud, low_latency=self.low_latency,
+                                        match_response_id=self.match_response_id)
 
             # Connect
             if not self.protocol.connect():
@@ -156,37 +385,233 @@ class afcACE(afcUnit):
             model = self.device_info.get('model', 'Unknown')
             firmware = self.device_info.get('firmware', 'Unknown')
 
-            logging.info(f"AFC_ACE: ✓ Connected to {model} (FW: {firmware}) at {self.serial}")
+            logging.info("AFC_ACE: ✓ Connected to %s (FW: %s) at %s", model, firmware, self.serial)
 
-            # Get initial status (with delay to allow device to be ready)
-            import time
-            time.sleep(0.2)
-            self.last_status = self.protocol.get_status()
+            # Only pipeline moves if the device answers requests sent in one write
+            self.multi_command = self.batch_moves and self.protocol.probe_multi_command()
+            if self.batch_moves and not self.multi_command:
+                logging.info("AFC_ACE: ACE did not answer batched requests (FW: %s), using per-slot commands", firmware)
 
-            if not self.last_status:
-                logging.warning(f"AFC_ACE: Could not get initial status from {self.serial}, will retry later")
+            # Get initial status from a reactor callback so startup never blocks on it
+            self.reactor.register_callback(self._fetch_initial_status, self.reactor.monotonic() + 0.05)
 
         except Exception as e:
-            logging.error(f"AFC_ACE: Connection error: {e}")
+            logging.error("AFC_ACE: Connection error: %s", e)
             raise error(f"AFC_ACE: Failed to connect to ACE device: {e}")
 
+    def _fetch_initial_status(self, eventtime):
+        """
+        Fetch the first ACE status after connecting.
+
+        Retries with a short backoff while the device settles, pausing the
+        reactor greenlet rather than sleeping.
+
+        Args:
+            eventtime: Reactor event time
+        """
+        for delay in INITIAL_STATUS_BACKOFF:
+            if delay:
+                self.reactor.pause(self.reactor.monotonic() + delay)
+            try:
+                self.last_status = self._io_call(self.protocol.get_status, ignore_offline=True)
+            except Exception as e:
+                logging.debug("AFC_ACE: Initial status request failed: %s", e)
+                self.last_status = None
+            if self.last_status:
+                return
+
+        logging.warning("AFC_ACE: Could not get initial status from %s, will retry later", self.serial)
+
+    def _poll_status(self, eventtime):
+        """
+        Reactor timer that queues a status request on the I/O thread.
+
+        Never waits for the device; the result is stored in the status
+        cache by _store_polled_status() when it arrives. While the unit is
+        offline it sends a get_info probe instead, at most every
+        OFFLINE_BACKOFF seconds.
+
+        Args:
+            eventtime: Reactor event time
+
+        Returns:
+            Next wake time
+        """
+        if self._status_poll_pending is not None and not self._status_poll_pending.done():
+            return eventtime + STATUS_POLL_INTERVAL
+
+        # An on-demand refresh is already fetching the status
+        if self._status_inflight is not None:
+            return eventtime + STATUS_POLL_INTERVAL
+
+        if self._is_offline():
+            future = self._io_executor.submit(self.protocol.get_info)
+            future.add_done_callback(self._store_probe_result)
+            self._status_poll_pending = future
+            return eventtime + OFFLINE_BACKOFF
+
+        generation = self._status_generation
+        completion = self.reactor.completion()
+        future = self._io_executor.submit(self.protocol.get_status)
+        future.add_done_callback(lambda f: self._store_polled_status(f, generation, completion))
+        self._status_poll_pending = future
+        self._status_poll_shared = (generation, completion)
+
+        return eventtime + STATUS_POLL_INTERVAL
+
+    def _store_polled_status(self, future, generation: int, completion):
+        """
+        Store a background status result in the cache.
+
+        Runs on the I/O thread. Results requested before the last cache
+        invalidation are dropped. The outcome is also passed to completion
+        for any on-demand refresh waiting on this poll.
+
+        Args:
+            future: Completed get_status future
+            generation: Value of _status_generation when the poll was queued
+            completion: Reactor completion that receives a (result, exception) tuple
+        """
+        exc = future.exception()
+        status = None
+        if exc is not None:
+            logging.debug("AFC_ACE: Status poll failed: %s", exc)
+            self._mark_offline()
+        else:
+            status = future.result()
+            if status is None:
+                self._mark_offline()
+            elif generation == self._status_generation:
+                self._status_cache = status
+                self._status_cache_ts = time.monotonic()
+                self.last_status = status
+
+        self.reactor.async_complete(completion, (status, exc))
+
+    def _store_probe_result(self, future):
+        """
+        Bring the unit back online after a successful get_info probe.
+
+        Runs on the I/O thread.
+
+        Args:
+            future: Completed get_info future
+        """
+        if future.exception() is None and future.result():
+            logging.info("AFC_ACE: %s responding again, resuming I/O", self.name)
+            self._offline_until = 0.0
+        else:
+            self._mark_offline()
+
+    def _get_status_cached(self):
+        """
+        Get ACE status, reusing the last result if it is younger than the TTL.
+
+        While the background poller is running the cache is normally fresh,
+        so this only talks to the device after an invalidation.
+
+        Returns:
+            Status dictionary or None on error
+        """
+        if self._status_cache is not None and time.monotonic() - self._status_cache_ts < self._status_ttl:
+            return self._status_cache
+
+        if self._is_offline():
+            return None
+
+        # Callers that miss while a refresh is already in flight share its
+        # result, including a background poll queued since the last invalidation
+        completion = self._status_inflight
+        if completion is None:
+            poll = self._status_poll_pending
+            shared = self._status_poll_shared
+            if poll is not None and not poll.done() and shared[0] == self._status_generation:
+                completion = shared[1]
+            else:
+                completion = self._status_inflight = self._io_start(self.protocol.get_status)
+
+        try:
+            status = self._io_wait(completion, 'get_status')
+        finally:
+            if self._status_inflight is completion:
+                self._status_inflight = None
+
+        self._status_cache = status
+        self._status_cache_ts = time.monotonic()
+        if status:
+            self.last_status = status
+        return status
+
+    def _get_slot_states_cached(self):
+        """
+        Get the status string of every ACE slot.
+
+        The list is rebuilt only when the cached status changes.
+
+        Returns:
+            List of slot status strings indexed by slot, or None on error
+        """
+        status = self._get_status_cached()
+        if status is not self._slot_states_src:
+            self._slot_states_src = status
+            if status and 'slots' in status:
+                self._slot_states = [slot_info.get('status', 'unknown') for slot_info in status['slots']]
+            else:
+                self._slot_states = None
+        return self._slot_states
+
+    def _assist_is_current(self, slot: int, enable: bool) -> bool:
+        """Check whether the ACE is already known to have this feed assist state"""
+        return self._assist_state[slot] == enable and \
+            time.monotonic() - self._assist_state_ts[slot] < ASSIST_RESYNC_INTERVAL
+
+    def _record_assist(self, slot: int, enable):
+        """
+        Remember the feed assist state of a slot.
+
+        Args:
+            slot: ACE slot index
+            enable: New state, or None if unknown
+        """
+        if enable is False:
+            # feed_assist_off is not slot specific
+            self._assist_state = [None] * LANES_PER_ACE
+        self._assist_state[slot] = enable
+        self._assist_state_ts[slot] = time.monotonic()
+
+    def _invalidate_status_cache(self):
+        """Force the next status query to hit the device"""
+        self._status_generation += 1
+        self._status_cache_ts = 0.0
+
+        # Refresh in the background right away rather than waiting for the next tick
+        if self._status_timer is not None:
+            self.reactor.update_timer(self._status_timer, self.reactor.NOW)
+
     def _build_lane_mapping(self):
         """Build mapping between AFC lanes and ACE slots"""
         # Each lane in this unit corresponds to an ACE slot (0-3)
         # Lanes are registered with unit like "unit_name:slot_index"
 
         if not self.lanes:
-            logging.debug(f"AFC_ACE: No lanes registered yet for unit '{self.name}', skipping mapping")
+            logging.debug("AFC_ACE: No lanes registered yet for unit '%s', skipping mapping", self.name)
             return
 
-        for lane in self.lanes.values():
-            # Extract slot index from lane's unit specification
-            # Lane config: unit: ace1:0  means slot 0 of unit ace1
-            slot_index = lane.index  # This comes from unit:index in config
+        with self._lane_map_lock:
+            mapping = {}
+            for lane in list(self.lanes.values()):
+                # Extract slot index from lane's unit specification
+                # Lane config: unit: ace1:0  means slot 0 of unit ace1
+                slot_index = lane.index  # This comes from unit:index in config
 
-            self.lane_to_slot[lane.name] = slot_index
+                mapping[lane.name] = slot_index
+                # Cached on the lane so _get_slot_for_lane_obj() can skip the dict lookup
+                lane._ace_slot = slot_index
 
-            logging.info(f"AFC_ACE: Mapped lane '{lane.name}' → slot {slot_index}")
+                logging.info("AFC_ACE: Mapped lane '%s' → slot %s", lane.name, slot_index)
+
+            # Single reference swap publishes the new mapping atomically
+            self.lane_to_slot = MappingProxyType(mapping)
 
     def get_slot_for_lane(self, lane) -> int:
         """
@@ -195,19 +620,51 @@ class afcACE(afcUnit):
         Args:
             lane: AFC lane object or lane name
 
+        Returns:
+            ACE slot index (0-3)
+        """
+        if isinstance(lane, str):
+            return self._get_slot_for_lane_name(lane)
+        return self._get_slot_for_lane_obj(lane)
+
+    def _get_slot_for_lane_obj(self, lane) -> int:
+        """
+        Get ACE slot index for a lane object.
+
+        Used directly by internal callers, which always pass lane objects.
+
+        Args:
+            lane: AFC lane object
+
+        Returns:
+            ACE slot index (0-3)
+        """
+        # Lane objects carry their slot once mapping is built
+        slot = getattr(lane, '_ace_slot', None)
+        if slot is not None:
+            return slot
+        return self._get_slot_for_lane_name(lane.name)
+
+    def _get_slot_for_lane_name(self, lane_name: str) -> int:
+        """
+        Get ACE slot index for a lane name.
+
+        Args:
+            lane_name: AFC lane name
+
         Returns:
             ACE slot index (0-3)
         """
         # Build mapping lazily if not done yet
-        if not self.lane_to_slot and self.lanes:
+        mapping = self.lane_to_slot
+        if not mapping and self.lanes:
             self._build_lane_mapping()
+            mapping = self.lane_to_slot
 
-        lane_name = lane if isinstance(lane, str) else lane.name
-
-        if lane_name not in self.lane_to_slot:
+        if lane_name not in mapping:
             raise error(f"AFC_ACE: Lane '{lane_name}' not mapped to ACE slot")
 
-        return self.lane_to_slot[lane_name]
+        return mapping[lane_name]
 
     def move_lane(self, lane, distance: float, speed: int, assist: bool = False):
         """
@@ -222,36 +679,90 @@ class afcACE(afcUnit):
             speed: Speed (10-80)
             assist: Enable feed assist during move
         """
-        slot = self.get_slot_for_lane(lane)
-
-        # Clamp speed to ACE limits (10-80)
-        speed = max(10, min(80, int(speed)))
+        self.move_lanes_batch([(lane, distance, speed, assist)])
 
-        try:
-            if distance > 0:
-                # Feed forward
-                logging.debug(f"AFC_ACE: Feed slot {slot} distance {distance}mm speed {speed}")
+    def move_lanes_batch(self, moves):
+        """
+        Move filament in several lanes.
 
-                if assist:
-                    self.protocol.set_feed_assist(slot, True)
+        When the firmware supports it, all moves are sent to the ACE in a
+        single serial write instead of one round-trip per lane.
 
-                success = self.protocol.feed(slot, distance, speed)
+        Args:
+            moves: List of (lane, distance, speed, assist) tuples, see move_lane()
 
-                if not success:
-                    logging.error(f"AFC_ACE: Feed command failed for slot {slot}")
+        Returns:
+            List of success flags, one per move
+        """
+        ops = []
+        for lane, distance, speed, assist in moves:
+            slot = self._get_slot_for_lane_obj(lane)
+
+            # Clamp speed to ACE limits (10-80)
+            speed = int(speed)
+            if speed < self._SPEED_MIN:
+                speed = self._SPEED_MIN
+            elif speed > self._SPEED_MAX:
+                speed = self._SPEED_MAX
+
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                if distance > 0:
+                    logging.debug("AFC_ACE: Feed slot %s distance %smm speed %s", slot, distance, speed)
+                else:
+                    logging.debug("AFC_ACE: Retract slot %s distance %smm speed %s", slot, abs(distance), speed)
+
+            # Skip the feed assist command if the slot already has it on
+            assist = assist and distance > 0 and not self._assist_is_current(slot, True)
+            ops.append({'lane': lane, 'index': slot, 'length': distance, 'speed': speed, 'assist': assist})
 
+        try:
+            if self.multi_command and len(ops) > 1:
+                results = self._io_call(self.protocol.feed_multi, ops)
+                if results:
+                    for op, success in zip(ops, results):
+                        if op['assist'] and success:
+                            self._record_assist(op['index'], True)
             else:
-                # Retract backward
-                logging.debug(f"AFC_ACE: Retract slot {slot} distance {abs(distance)}mm speed {speed}")
+                results = self._io_call(self._move_slots, ops)
 
-                success = self.protocol.retract(slot, abs(distance), speed)
+            if results is None:
+                results = [False] * len(ops)
 
+            for op, success in zip(ops, results):
                 if not success:
-                    logging.error(f"AFC_ACE: Retract command failed for slot {slot}")
+                    action = 'Feed' if op['length'] > 0 else 'Retract'
+                    logging.error("AFC_ACE: %s command failed for slot %s", action, op['index'])
+
+            return results
 
         except Exception as e:
-            logging.error(f"AFC_ACE: Error moving lane '{lane.name}': {e}")
+            names = ', '.join(op['lane'].name for op in ops)
+            logging.error("AFC_ACE: Error moving lane '%s': %s", names, e)
             raise
+        finally:
+            self._invalidate_status_cache()
+
+    def _move_slots(self, ops):
+        """
+        Send feed/retract commands to the ACE one slot at a time.
+
+        Runs on the I/O thread.
+
+        Args:
+            ops: Move dicts built by move_lanes_batch()
+
+        Returns:
+            List of success flags, one per op
+        """
+        results = []
+        for op in ops:
+            if op['length'] > 0:
+                if op['assist'] and self.protocol.set_feed_assist(op['index'], True):
+                    self._record_assist(op['index'], True)
+                results.append(self.protocol.feed(op['index'], op['length'], op['speed']))
+            else:
+                results.append(self.protocol.retract(op['index'], abs(op['length']), op['speed']))
+        return results
 
     def get_lane_status(self, lane) -> str:
         """
@@ -263,23 +774,21 @@ class afcACE(afcUnit):
         Returns:
             Status string ('empty', 'ready', 'error', etc.)
         """
-        slot = self.get_slot_for_lane(lane)
+        slot = self._get_slot_for_lane_obj(lane)
 
         try:
             # Get status from ACE
-            status = self.protocol.get_status()
-
-            if status and 'slots' in status:
-                slot_status = status['slots'][slot]['status']
+            slot_states = self._get_slot_states_cached()
 
+            if slot_states:
                 # Map ACE status to AFC lane state
                 # ACE statuses: 'empty', 'ready', 'loading', 'error'
-                return slot_status
+                return slot_states[slot]
 
             return 'unknown'
 
         except Exception as e:
-            logging.error(f"AFC_ACE: Error getting lane status: {e}")
+            logging.error("AFC_ACE: Error getting lane status: %s", e)
             return 'error'
 
     def enable_feed_assist(self, lane, enable: bool = True):
@@ -290,18 +799,26 @@ class afcACE(afcUnit):
             lane: AFC lane object
             enable: True to enable, False to disable
         """
-        slot = self.get_slot_for_lane(lane)
+        slot = self._get_slot_for_lane_obj(lane)
 
-        try:
-            success = self.protocol.set_feed_assist(slot, enable)
+        if self._assist_is_current(slot, enable):
+            return
 
-            if success:
-                logging.debug(f"AFC_ACE: Feed assist {'enabled' if enable else 'disabled'} for slot {slot}")
-            else:
-                logging.warning(f"AFC_ACE: Failed to set feed assist for slot {slot}")
+        # Fire-and-forget: the single I/O worker keeps this ordered before any following move
+        future = self._io_submit(self.protocol.set_feed_assist, slot, enable,
+                                 description=f"set feed assist for slot {slot}")
+        if future is None:
+            return
+        self._record_assist(slot, enable)
 
-        except Exception as e:
-            logging.error(f"AFC_ACE: Error setting feed assist: {e}")
+        def forget_on_failure(future):
+            if future.exception() is not None or not future.result():
+                self._record_assist(slot, None)
+
+        future.add_done_callback(forget_on_failure)
+        self._invalidate_status_cache()
+
+        logging.debug("AFC_ACE: Feed assist %s for slot %s", 'enabled' if enable else 'disabled', slot)
 
     def start_dryer(self, temp: int, duration: int = 240):
         """
@@ -312,28 +829,30 @@ class afcACE(afcUnit):
             duration: Duration in minutes (default 240)
         """
         try:
-            success = self.protocol.start_dryer(temp, duration)
+            success = self._io_call(self.protocol.start_dryer, temp, duration)
+            self._invalidate_status_cache()
 
             if success:
-                logging.info(f"AFC_ACE: Dryer started at {temp}°C for {duration} minutes")
+                logging.info("AFC_ACE: Dryer started at %s°C for %s minutes", temp, duration)
             else:
-                logging.warning(f"AFC_ACE: Failed to start dryer")
+                logging.warning("AFC_ACE: Failed to start dryer")
 
         except Exception as e:
-            logging.error(f"AFC_ACE: Error starting dryer: {e}")
+            logging.error("AFC_ACE: Error starting dryer: %s", e)
 
     def stop_dryer(self):
         """Stop ACE dryer"""
         try:
-            success = self.protocol.stop_dryer()
+            success = self._io_call(self.protocol.stop_dryer)
+            self._invalidate_status_cache()
 
             if success:
-                logging.info(f"AFC_ACE: Dryer stopped")
+                logging.info("AFC_ACE: Dryer stopped")
             else:
-                logging.warning(f"AFC_ACE: Failed to stop dryer")
+                logging.warning("AFC_ACE: Failed to stop dryer")
 
         except Exception as e:
-            logging.error(f"AFC_ACE: Error stopping dryer: {e}")
+            logging.error("AFC_ACE: Error stopping dryer: %s", e)
 
     def system_Test(self, cur_lane, delay, assignTcmd, enable_movement):
         """
@@ -348,84 +867,89 @@ class afcACE(afcUnit):
             assignTcmd: Whether to assign T command
             enable_movement: Whether to enable movement (for ACE, we just query status)
         """
-        # Ensure lane mapping is built (lazy initialization)
-        if not self.lane_to_slot and self.lanes:
-            self._build_lane_mapping()
-
-        msg = ''
-        succeeded = True
-
-        slot = self.get_slot_for_lane(cur_lane)
+        slot = self._get_slot_for_lane_obj(cur_lane)
 
         try:
             # Get ACE slot status
-            status = self.protocol.get_status()
+            slot_states = self._get_slot_states_cached()
 
-            if not status or 'slots' not in status:
+            if not slot_states:
                 # Communication error - but don't fail entirely, mark lane as unknown
-                logging.warning(f"AFC_ACE: Could not get status for lane '{cur_lane.name}' (slot {slot})")
+                logging.warning("AFC_ACE: Could not get status for lane '%s' (slot %s)", cur_lane.name, slot)
                 self.afc.function.afc_led(cur_lane.led_not_ready, cur_lane.led_index)
-                msg = "<span class=warning--text>UNKNOWN (Communication Error)</span>"
+                msg = _MSG_COMM
                 cur_lane.status = AFCLaneState.NONE
                 cur_lane.prep_state = True  # Set prep_state (exposed as 'prep' in API)
                 cur_lane.load_state = True  # Set load_state (exposed as 'load' in API)
-                logging.info(f"AFC_ACE: Set lane '{cur_lane.name}' prep_state={cur_lane.prep_state} load_state={cur_lane.load_state}")
-                succeeded = True  # Don't fail prep for communication errors
-                return msg, succeeded
-
-            slot_info = status['slots'][slot]
-            slot_status = slot_info['status']
+                logging.info("AFC_ACE: Set lane '%s' prep_state=%s load_state=%s", cur_lane.name, cur_lane.prep_state, cur_lane.load_state)
+                return msg, True  # Don't fail prep for communication errors
 
             # Map ACE status to AFC states
-            if slot_status == 'empty':
-                self.afc.function.afc_led(cur_lane.led_not_ready, cur_lane.led_index)
-                msg = 'EMPTY READY FOR SPOOL'
-                cur_lane.status = AFCLaneState.NONE
-                cur_lane.prep_state = True  # Lane is prepped (empty, ready for spool)
-                cur_lane.load_state = True
-                succeeded = True
-
-            elif slot_status == 'ready':
-                self.afc.function.afc_led(cur_lane.led_ready, cur_lane.led_index)
-                msg = "<span class=success--text>LOCKED AND LOADED</span>"
-                cur_lane.status = AFCLaneState.LOADED
-                cur_lane.prep_state = True  # Lane is prepped (filament loaded and ready)
-                cur_lane.load_state = True
-                succeeded = True
-
-                # Illuminate spool LED
-                self.afc.function.afc_led(cur_lane.led_spool_illum, cur_lane.led_spool_index)
-
-                # Check if loaded into toolhead
-                if cur_lane.tool_loaded:
-                    if cur_lane.extruder_obj and cur_lane.extruder_obj.lane_loaded == cur_lane.name:
-                        self.afc.current = cur_lane.name
-                        msg += "<span class=primary--text> in ToolHead</span>"
-
-                        if self.afc.function.get_current_lane() == cur_lane.name:
-                            self.afc.spool.set_active_spool(cur_lane.spool_id)
-                            cur_lane.unit_obj.lane_tool_loaded(cur_lane)
-                            cur_lane.status = AFCLaneState.TOOLED
-
-            elif slot_status == 'error':
-                self.afc.function.afc_led(cur_lane.led_fault, cur_lane.led_index)
-                msg = "<span class=error--text>SLOT ERROR</span>"
-                cur_lane.status = AFCLaneState.ERROR
-                succeeded = False
-
-            else:
-                # Unknown status
-                self.afc.function.afc_led(cur_lane.led_fault, cur_lane.led_index)
-                msg = f"<span class=warning--text>UNKNOWN STATUS: {slot_status}</span>"
-                succeeded = False
+            slot_status = slot_states[slot]
+            handler = self._STATUS_HANDLERS.get(slot_status, afcACE._handle_unknown)
+            return handler(self, cur_lane, slot_status)
 
         except Exception as e:
-            logging.error(f"AFC_ACE: Error during system test: {e}")
+            logging.error("AFC_ACE: Error during system test: %s", e)
             self.afc.function.afc_led(cur_lane.led_fault, cur_lane.led_index)
-            msg = "<span class=error--text>TEST ERROR</span>"
-            succeeded = False
-
-        return msg, succeeded
+            msg = _MSG_TEST_ERROR
+            return msg, False
+
+    def _handle_empty(self, cur_lane, slot_status):
+        """system_Test handler for an empty slot"""
+        self.afc.function.afc_led(cur_lane.led_not_ready, cur_lane.led_index)
+        cur_lane.status = AFCLaneState.NONE
+        cur_lane.prep_state = True  # Lane is prepped (empty, ready for spool)
+        cur_lane.load_state = True
+        return _MSG_EMPTY, True
+
+    def _handle_ready(self, cur_lane, slot_status):
+        """system_Test handler for a slot with filament loaded"""
+        afc = self.afc
+        afc_led = afc.function.afc_led
+        lane_name = cur_lane.name
+
+        afc_led(cur_lane.led_ready, cur_lane.led_index)
+        msg = _MSG_LOADED
+        cur_lane.status = AFCLaneState.LOADED
+        cur_lane.prep_state = True  # Lane is prepped (filament loaded and ready)
+        cur_lane.load_state = True
+
+        # Illuminate spool LED
+        afc_led(cur_lane.led_spool_illum, cur_lane.led_spool_index)
+
+        # Check if loaded into toolhead
+        if cur_lane.tool_loaded:
+            extruder_obj = cur_lane.extruder_obj
+            loaded_name = extruder_obj.lane_loaded if extruder_obj else None
+            if loaded_name == lane_name:
+                afc.current = lane_name
+                msg += _MSG_IN_TOOLHEAD
+
+                if afc.function.get_current_lane() == lane_name:
+                    afc.spool.set_active_spool(cur_lane.spool_id)
+                    cur_lane.unit_obj.lane_tool_loaded(cur_lane)
+                    cur_lane.status = AFCLaneState.TOOLED
+
+        return msg, True
+
+    def _handle_error(self, cur_lane, slot_status):
+        """system_Test handler for a slot reporting an error"""
+        self.afc.function.afc_led(cur_lane.led_fault, cur_lane.led_index)
+        cur_lane.status = AFCLaneState.ERROR
+        return _MSG_ERROR, False
+
+    def _handle_unknown(self, cur_lane, slot_status):
+        """system_Test handler for any other slot status"""
+        self.afc.function.afc_led(cur_lane.led_fault, cur_lane.led_index)
+        return _MSG_UNKNOWN_FMT % slot_status, False
+
+    # ACE slot status -> system_Test handler
+    _STATUS_HANDLERS = {
+        'empty': _handle_empty,
+        'ready': _handle_ready,
+        'error': _handle_error,
+    }
 
     def lane_tool_loaded(self, cur_lane):
         """
@@ -438,7 +962,7 @@ class afcACE(afcUnit):
         if cur_lane.led_index is not None:
             self.afc.function.afc_led(cur_lane.led_tool_loaded, cur_lane.led_index)
 
-        logging.info(f"AFC_ACE: Lane '{cur_lane.name}' loaded into toolhead")
+        logging.info("AFC_ACE: Lane '%s' loaded into toolhead", cur_lane.name)
 
     def calibrate_lane(self, cur_lane, tol):
         """
@@ -454,13 +978,13 @@ class afcACE(afcUnit):
         Returns:
             Tuple of (checked, msg, pos)
         """
-        slot = self.get_slot_for_lane(cur_lane)
+        slot = self._get_slot_for_lane_obj(cur_lane)
 
         # ACE handles filament positioning internally, no calibration needed
         msg = f"ACE Pro slot {slot} does not require calibration - device manages filament internally"
 
         self.afc.gcode.respond_info(msg)
-        logging.info(f"AFC_ACE: {msg}")
+        logging.info("AFC_ACE: %s", msg)
 
         # Return success with current position (ACE manages this internally)
         return True, msg, 0.0
@@ -13,19 +13,52 @@ Handles USB enumeration and device identification
 import serial
 import serial.tools.list_ports
 import logging
-import re
+import concurrent.futures
 import os
-import glob
+import string
+import threading
+import time
 import hashlib
 from typing import List, Dict, Optional, Any
 from .AFC_ACE_protocol import AceProtocol, ACE_VID, ACE_PID
 
+# Optional: pyudev lets us drop cached scans on hotplug instead of on a timer
+try:
+    import pyudev
+except ImportError:
+    pyudev = None
+
+BY_PATH_DIR = '/dev/serial/by-path'
+BY_ID_DIR = '/dev/serial/by-id'
+
+# Byte translation table mapping everything except [a-zA-Z0-9_] to '_'
+_SANITIZE_ALLOWED = (string.ascii_letters + string.digits + '_').encode('ascii')
+_SANITIZE_TABLE = bytes(c if c in _SANITIZE_ALLOWED else ord('_') for c in range(256))
+
 
 class AceDiscovery:
     """Auto-detect ACE Pro devices on USB"""
 
     ACE_MANUFACTURER = "GDMicroelectronics"
     ACE_PRODUCT_NAME = "ACE"
+    _ACE_MANUFACTURER_UPPER = ACE_MANUFACTURER.upper()
+    _ACE_PRODUCT_NAME_UPPER = ACE_PRODUCT_NAME.upper()
+
+    # Last serial port enumeration (timestamp, ports)
+    _comports_cache = None
+
+    # Last find_ace_devices() result (timestamp, devices)
+    _devices_cache = None
+    _devices_cache_ttl = 3.0
+    _cache_generation = 0  # Bumped on every invalidation
+
+    # Background udev monitor thread (None when not watching)
+    _udev_thread = None
+    _udev_lock = threading.Lock()
+
+    # Reverse symlink maps ({directory: (timestamp, {tty_realpath: link})})
+    _symlink_maps = {}
+    _symlink_map_ttl = 5.0
 
     @staticmethod
     def sanitize_device_id(device_id: str) -> str:
@@ -40,7 +73,71 @@ class AceDiscovery:
         Returns:
             Sanitized device ID safe for use as Python variable name
         """
-        return re.sub(r'[^a-zA-Z0-9_]', '_', device_id)
+        # Non-ASCII characters become '?' (one per character) and are then replaced too
+        return device_id.encode('ascii', 'replace').translate(_SANITIZE_TABLE).decode('ascii')
+
+    @staticmethod
+    def _build_symlink_map(directory: str) -> Dict[str, str]:
+        """
+        Map the devices behind a directory of symlinks back to the links.
+
+        Args:
+            directory: Symlink directory like /dev/serial/by-path
+
+        Returns:
+            Dictionary of {real device path: symlink path}
+        """
+        symlink_map = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_symlink():
+                    continue
+
+                # udev links are relative (../../ttyACM0); resolve them
+                # lexically and only fall back to realpath for link chains
+                target = os.path.normpath(os.path.join(directory, os.readlink(entry.path)))
+                if os.path.islink(target):
+                    target = os.path.realpath(target)
+
+                symlink_map[target] = entry.path
+        return symlink_map
+
+    @staticmethod
+    def _get_symlink_map(directory: str) -> Dict[str, str]:
+        """
+        Get the reverse symlink map for a directory, reusing a recent scan.
+
+        Args:
+            directory: Symlink directory like /dev/serial/by-path
+
+        Returns:
+            Dictionary of {real device path: symlink path}
+        """
+        cached = AceDiscovery._symlink_maps.get(directory)
+        if cached is not None and AceDiscovery._cache_is_fresh(cached[0], AceDiscovery._symlink_map_ttl):
+            return cached[1]
+
+        return AceDiscovery._refresh_symlink_map(directory)
+
+    @staticmethod
+    def _refresh_symlink_map(directory: str) -> Dict[str, str]:
+        """
+        Rescan a symlink directory and update the cached reverse map.
+
+        Args:
+            directory: Symlink directory like /dev/serial/by-path
+
+        Returns:
+            Dictionary of {real device path: symlink path}, empty if the directory doesn't exist
+        """
+        try:
+            symlink_map = AceDiscovery._build_symlink_map(directory)
+        except OSError as e:
+            logging.debug(f"AFC_ACE: Could not scan {directory}: {e}")
+            symlink_map = {}
+
+        AceDiscovery._symlink_maps[directory] = (time.monotonic(), symlink_map)
+        return symlink_map
 
     @staticmethod
     def find_by_path_for_device(tty_device: str) -> Optional[str]:
@@ -58,19 +155,10 @@ class AceDiscovery:
         """
         try:
             # Only available on Linux
-            if not os.path.exists('/dev/serial/by-path'):
+            if not os.path.exists(BY_PATH_DIR):
                 return None
 
-            # Get the real path of the tty device
-            real_tty = os.path.realpath(tty_device)
-
-            # Search all by-path symlinks
-            by_path_pattern = "/dev/serial/by-path/*"
-            for path in glob.glob(by_path_pattern):
-                if os.path.realpath(path) == real_tty:
-                    return path
-
-            return None
+            return AceDiscovery._get_symlink_map(BY_PATH_DIR).get(os.path.realpath(tty_device))
         except Exception as e:
             logging.debug(f"AFC_ACE: Could not resolve by-path for {tty_device}: {e}")
             return None
@@ -91,23 +179,102 @@ class AceDiscovery:
         """
         try:
             # Only available on Linux
-            if not os.path.exists('/dev/serial/by-id'):
+            if not os.path.exists(BY_ID_DIR):
                 return None
 
-            # Get the real path of the tty device
-            real_tty = os.path.realpath(tty_device)
-
-            # Search all by-id symlinks
-            by_id_pattern = "/dev/serial/by-id/*"
-            for path in glob.glob(by_id_pattern):
-                if os.path.realpath(path) == real_tty:
-                    return path
-
-            return None
+            return AceDiscovery._get_symlink_map(BY_ID_DIR).get(os.path.realpath(tty_device))
         except Exception as e:
             logging.debug(f"AFC_ACE: Could not resolve by-id for {tty_device}: {e}")
             return None
 
+    @staticmethod
+    def _cached_comports(max_age: float = 3.0) -> List[Any]:
+        """
+        Enumerate serial ports, reusing a recent result.
+
+        Args:
+            max_age: Maximum age of a cached enumeration in seconds
+
+        Returns:
+            List of pyserial ListPortInfo objects
+        """
+        cached = AceDiscovery._comports_cache
+        if cached is not None and AceDiscovery._cache_is_fresh(cached[0], max_age):
+            return cached[1]
+
+        ports = serial.tools.list_ports.comports()
+        AceDiscovery._comports_cache = (time.monotonic(), ports)
+        return ports
+
+    @staticmethod
+    def invalidate_cache():
+        """Drop cached port enumeration, symlink maps and discovered devices"""
+        AceDiscovery._cache_generation += 1
+        AceDiscovery._comports_cache = None
+        AceDiscovery._devices_cache = None
+        AceDiscovery._symlink_maps.clear()
+
+    @staticmethod
+    def _cache_is_fresh(timestamp: float, max_age: float) -> bool:
+        """
+        Check whether a cached scan can be reused.
+
+        While the udev monitor is running, caches are dropped on hotplug
+        events, so they stay valid regardless of age.
+
+        Args:
+            timestamp: time.monotonic() value when the scan was made
+            max_age: Maximum age in seconds when not watching udev
+
+        Returns:
+            True if the cached scan can be used
+        """
+        return AceDiscovery._udev_thread is not None or time.monotonic() - timestamp < max_age
+
+    @staticmethod
+    def _start_udev_watch() -> bool:
+        """
+        Start a background thread that invalidates caches on tty hotplug.
+
+        Returns:
+            True if the monitor is running, False if pyudev is unavailable
+            or netlink couldn't be opened (caches then fall back to TTLs)
+        """
+        if pyudev is None:
+            return False
+
+        with AceDiscovery._udev_lock:
+            if AceDiscovery._udev_thread is not None:
+                return True
+
+            try:
+                monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+                monitor.filter_by('tty')
+                monitor.start()
+            except Exception as e:
+                logging.debug(f"AFC_ACE: udev monitor unavailable, using timed rescans: {e}")
+                return False
+
+            thread = threading.Thread(target=AceDiscovery._udev_watch_loop, args=(monitor,),
+                                      name="ace-udev", daemon=True)
+            AceDiscovery._udev_thread = thread
+            thread.start()
+            return True
+
+    @staticmethod
+    def _udev_watch_loop(monitor):
+        """Drop cached scans whenever a tty device is added or removed"""
+        try:
+            for device in iter(monitor.poll, None):
+                logging.debug(f"AFC_ACE: udev {device.action} {device.device_node}, invalidating discovery cache")
+                AceDiscovery.invalidate_cache()
+        except Exception as e:
+            logging.warning(f"AFC_ACE: udev monitor stopped: {e}")
+        finally:
+            # Caches stop being trusted indefinitely once nothing invalidates them
+            AceDiscovery._udev_thread = None
+            AceDiscovery.invalidate_cache()
+
     @staticmethod
     def _generate_device_id(device_info: Dict[str, Any]) -> str:
         """
@@ -123,17 +290,13 @@ class AceDiscovery:
             Device ID string (e.g., 'hub_1_port_1_3')
         """
         # Always use USB location as the primary device ID
-        if 'usb_location' in device_info and device_info['usb_location']:
+        usb_loc = device_info.get('usb_location')
+        if usb_loc:
             # USB location like "1-1.2" is stable as long as device stays in same port
             # Convert to readable format: "1-1.2" → "hub_1_port_1_2"
-            usb_loc = device_info['usb_location']
-
-            # Parse USB location format (e.g., "1-1.2" means bus 1, port 1.2)
-            parts = usb_loc.split('-')
-            if len(parts) >= 2:
-                # Get the port path (everything after the bus number)
-                port_path = parts[1]
-                device_id = f"hub_{parts[0]}_port_{port_path}"
+            bus, sep, port_path = usb_loc.partition('-')
+            if sep:
+                device_id = f"hub_{bus}_port_{port_path}"
             else:
                 # Fallback for simple format
                 device_id = f"usb_{usb_loc}"
@@ -141,117 +304,118 @@ class AceDiscovery:
             # Sanitize to ensure valid Python identifier
             return AceDiscovery.sanitize_device_id(device_id)
 
-        # Fallback: MAC address (if firmware provides it)
-        if 'mac_address' in device_info and device_info['mac_address']:
-            mac = device_info['mac_address']
-            logging.info(f"AFC_ACE: Using MAC address for device_id (USB location not available)")
-            return AceDiscovery.sanitize_device_id(f"mac_{mac}")
-
-        # Fallback: Serial number (if firmware provides it)
-        if 'serial_number' in device_info and device_info['serial_number']:
-            sn = device_info['serial_number']
-            logging.info(f"AFC_ACE: Using serial number for device_id (USB location not available)")
-            return AceDiscovery.sanitize_device_id(f"sn_{sn}")
+        # Fallbacks: MAC address, then serial number (if firmware provides them)
+        for key, prefix, label in (('mac_address', 'mac', 'MAC address'),
+                                   ('serial_number', 'sn', 'serial number')):
+            value = device_info.get(key)
+            if value:
+                logging.info(f"AFC_ACE: Using {label} for device_id (USB location not available)")
+                return AceDiscovery.sanitize_device_id(f"{prefix}_{value}")
 
         # Last resort: Hash of firmware + model (NOT recommended)
         unique_str = f"{device_info.get('model', '')}_{device_info.get('firmware', '')}"
-        hash_val = hashlib.md5(unique_str.encode()).hexdigest()[:8]
+        hash_val = hashlib.blake2b(unique_str.encode('ascii', 'replace'), digest_size=4).hexdigest()
         logging.warning(f"AFC_ACE: Using firmware hash for device_id (not unique!)")
         return f"fw_{hash_val}"
 
     @staticmethod
-    def find_ace_devices() -> List[Dict[str, Any]]:
+    def find_ace_devices(force_rescan: bool = False) -> List[Dict[str, Any]]:
         """
         Scan all USB serial ports and identify ACE devices.
 
+        Results are reused until a udev hotplug event (or, without pyudev,
+        a short TTL) says the USB topology may have changed.
+
+        Args:
+            force_rescan: Ignore cached scans
+
         Returns:
             List of device info dictionaries
         """
+        # Start watching before scanning so a plug event mid-scan isn't missed
+        AceDiscovery._start_udev_watch()
+
+        if force_rescan:
+            AceDiscovery.invalidate_cache()
+        else:
+            cached = AceDiscovery._devices_cache
+            if cached is not None and AceDiscovery._cache_is_fresh(cached[0], AceDiscovery._devices_cache_ttl):
+                return list(cached[1])
+
+        generation = AceDiscovery._cache_generation
         ace_devices = []
-        ports = serial.tools.list_ports.comports()
+        ports = AceDiscovery._cached_comports()
+
+        # Resolve all by-path symlinks in one directory scan
+        by_path_map = AceDiscovery._refresh_symlink_map(BY_PATH_DIR)
 
         logging.info(f"AFC_ACE Discovery: Scanning {len(ports)} USB serial ports...")
 
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            for port in ports:
+                # Log all ports for debugging
+                logging.debug(f"  Port: {port.device}")
+                logging.debug(f"    VID:PID = 0x{port.vid:04X}:0x{port.pid:04X}" if port.vid and port.pid else "    VID:PID = None")
+                logging.debug(f"    Manufacturer: {port.manufacturer}")
+                logging.debug(f"    Product: {port.product}")
+                logging.debug(f"    Serial: {port.serial_number}")
+                logging.debug(f"    Location: {port.location}")
+
+        # Filter first so device info is only built for the few candidates
+        manufacturer = AceDiscovery._ACE_MANUFACTURER_UPPER
+        product = AceDiscovery._ACE_PRODUCT_NAME_UPPER
+        candidates = []
         for port in ports:
-            # Log all ports for debugging
-            logging.debug(f"  Port: {port.device}")
-            logging.debug(f"    VID:PID = 0x{port.vid:04X}:0x{port.pid:04X}" if port.vid and port.pid else "    VID:PID = None")
-            logging.debug(f"    Manufacturer: {port.manufacturer}")
-            logging.debug(f"    Product: {port.product}")
-            logging.debug(f"    Serial: {port.serial_number}")
-            logging.debug(f"    Location: {port.location}")
-
             # Method 1: VID/PID matching (most reliable)
             if port.vid == ACE_VID:
-                logging.info(f"  ✓ Found ACE device by VID (0x{ACE_VID:04X}) at {port.device}")
-
-                # Find stable by-path symlink (REQUIRED for Linux operation)
-                by_path = AceDiscovery.find_by_path_for_device(port.device)
-
-                if not by_path:
-                    logging.warning(f"  ✗ No /dev/serial/by-path symlink found for {port.device}")
-                    logging.warning(f"  Skipping device - by-path required for stable operation")
-                    continue
-
-                logging.info(f"  ✓ by-path: {by_path}")
-
-                device_info = {
-                    'port': by_path,  # Use by-path as the primary port
-                    'port_tty': port.device,  # Keep ttyACM for reference/logging only
-                    'hwid': port.hwid,
-                    'serial_number': port.serial_number,
-                    'manufacturer': port.manufacturer,
-                    'product': port.product,
-                    'vid': port.vid,
-                    'pid': port.pid,
-                    'location': port.location,  # USB hub location for stable ordering
-                    'usb_location': port.location
-                }
-
-                # Generate device_id
-                device_info['device_id'] = AceDiscovery._generate_device_id(device_info)
-                ace_devices.append(device_info)
-
+                candidates.append((port, f"VID (0x{ACE_VID:04X})"))
             # Method 2: Manufacturer/Product string matching (fallback)
-            elif (port.manufacturer and AceDiscovery.ACE_MANUFACTURER.upper() in str(port.manufacturer).upper()) or \
-                 (port.product and AceDiscovery.ACE_PRODUCT_NAME.upper() in str(port.product).upper()):
-                logging.info(f"  ✓ Found ACE device by manufacturer/product string at {port.device}")
-
-                # Find stable by-path symlink (REQUIRED for Linux operation)
-                by_path = AceDiscovery.find_by_path_for_device(port.device)
-
-                if not by_path:
-                    logging.warning(f"  ✗ No /dev/serial/by-path symlink found for {port.device}")
-                    logging.warning(f"  Skipping device - by-path required for stable operation")
-                    continue
-
-                logging.info(f"  ✓ by-path: {by_path}")
-
-                device_info = {
-                    'port': by_path,  # Use by-path as the primary port
-                    'port_tty': port.device,  # Keep ttyACM for reference/logging only
-                    'hwid': port.hwid,
-                    'serial_number': port.serial_number,
-                    'manufacturer': port.manufacturer,
-                    'product': port.product,
-                    'vid': port.vid,
-                    'pid': port.pid,
-                    'location': port.location,
-                    'usb_location': port.location
-                }
-
-                # Generate device_id
-                device_info['device_id'] = AceDiscovery._generate_device_id(device_info)
-                ace_devices.append(device_info)
+            elif (port.manufacturer and manufacturer in str(port.manufacturer).upper()) or \
+                 (port.product and product in str(port.product).upper()):
+                candidates.append((port, "manufacturer/product string"))
+
+        for port, matched_by in candidates:
+            logging.info(f"  ✓ Found ACE device by {matched_by} at {port.device}")
+
+            # Find stable by-path symlink (REQUIRED for Linux operation)
+            by_path = by_path_map.get(os.path.realpath(port.device))
+
+            if not by_path:
+                logging.warning(f"  ✗ No /dev/serial/by-path symlink found for {port.device}")
+                logging.warning(f"  Skipping device - by-path required for stable operation")
+                continue
+
+            logging.info(f"  ✓ by-path: {by_path}")
+
+            device_info = {
+                'port': by_path,  # Use by-path as the primary port
+                'port_tty': port.device,  # Keep ttyACM for reference/logging only
+                'hwid': port.hwid,
+                'serial_number': port.serial_number,
+                'manufacturer': port.manufacturer,
+                'product': port.product,
+                'vid': port.vid,
+                'pid': port.pid,
+                'location': port.location,  # USB hub location for stable ordering
+                'usb_location': port.location
+            }
+
+            # Generate device_id
+            device_info['device_id'] = AceDiscovery._generate_device_id(device_info)
+            ace_devices.append(device_info)
 
         # Sort by USB location for deterministic ordering
         ace_devices.sort(key=lambda x: x.get('location', '') or '')
 
         logging.info(f"AFC_ACE Discovery: Found {len(ace_devices)} ACE devices")
-        return ace_devices
+        # Don't cache a scan that raced with a hotplug event
+        if generation == AceDiscovery._cache_generation:
+            AceDiscovery._devices_cache = (time.monotonic(), ace_devices)
+        return list(ace_devices)
 
     @staticmethod
-    def probe_ace_device(port: str, baud: int = 115200, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+    def probe_ace_device(port: str, baud: int = 115200, timeout: float = 2.0,
+                         by_path_map: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
         """
         Connect to a port and verify it's an ACE device.
 
@@ -259,6 +423,7 @@ class AceDiscovery:
             port: Serial port path
             baud: Baud rate (default 115200)
             timeout: Serial timeout (default 2.0s)
+            by_path_map: Reverse by-path map from a previous scan, to avoid rescanning
 
         Returns:
             Device info dict or None if not ACE
@@ -271,6 +436,8 @@ class AceDiscovery:
 
             if not protocol.connect():
                 logging.warning(f"AFC_ACE Probe: Failed to connect to {port}")
+                # Device may have moved; don't trust the cached enumeration
+                AceDiscovery.invalidate_cache()
                 return None
 
             # Send get_info command
@@ -279,7 +446,10 @@ class AceDiscovery:
 
             if info:
                 # Find stable by-path symlink (REQUIRED)
-                by_path = AceDiscovery.find_by_path_for_device(port)
+                if by_path_map is not None:
+                    by_path = by_path_map.get(os.path.realpath(port))
+                else:
+                    by_path = AceDiscovery.find_by_path_for_device(port)
 
                 if not by_path:
                     logging.warning(f"AFC_ACE Probe: ✗ No /dev/serial/by-path symlink found for {port}")
@@ -302,8 +472,45 @@ class AceDiscovery:
                 return device_info
             else:
                 logging.warning(f"AFC_ACE Probe: No response from {port}")
+                AceDiscovery.invalidate_cache()
                 return None
 
         except Exception as e:
             logging.error(f"AFC_ACE Probe: Error probing {port}: {e}")
+            AceDiscovery.invalidate_cache()
             return None
+
+    @staticmethod
+    def probe_ace_devices_parallel(ports: List[str], baud: int = 115200,
+                                   timeout: float = 2.0) -> List[Optional[Dict[str, Any]]]:
+        """
+        Probe several ports at once.
+
+        Each probe mostly waits on its own serial port, so running them in
+        threads bounds the total time by the slowest probe instead of the sum.
+
+        Args:
+            ports: Serial port paths
+            baud: Baud rate (default 115200)
+            timeout: Serial timeout (default 2.0s)
+
+        Returns:
+            List of device info dicts (None where the port isn't an ACE), in the same order as ports
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ports)
+        if not ports:
+            return results
+
+        # Resolve by-path links once for all probes
+        by_path_map = AceDiscovery._get_symlink_map(BY_PATH_DIR)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(ports)),
+                                                   thread_name_prefix="ace-probe") as executor:
+            futures = {
+                executor.submit(AceDiscovery.probe_ace_device, port, baud, timeout, by_path_map): index
+                for index, port in enumerate(ports)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return results
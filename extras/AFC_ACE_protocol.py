@@ -10,16 +10,33 @@ ACE Pro USB Protocol Implementation
 Handles JSON-RPC communication over serial with ACE Pro devices
 """
 
+import os
+import select
+import selectors
 import struct
 import json
+import time
 import serial
 import logging
 import threading
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+
+# Optional: crcmod provides a C implementation of the CRC16 used below
+try:
+    import crcmod
+except ImportError:
+    crcmod = None
+
+# Optional: orjson encodes straight to bytes and decodes bytes/memoryview directly
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Protocol Constants
 PROTOCOL_HEAD_BYTES = bytes([0xFF, 0xAA])
 PROTOCOL_TAIL_BYTE = 0xFE
+PROTOCOL_TAIL = bytes([PROTOCOL_TAIL_BYTE])
 PROTOCOL_MIN_PACKET_SIZE = 7
 CRC_INIT_VALUE = 0xFFFF
 
@@ -30,11 +47,62 @@ LANES_PER_ACE = 4
 DEFAULT_BAUD_RATE = 115200
 DEFAULT_TIMEOUT = 2.0
 REQUEST_TIMEOUT = 2.0
+MAX_PAYLOAD_SIZE = 4096  # Larger length fields are treated as a false header match
+READ_BUFFER_COMPACT_SIZE = 4096  # Consumed bytes kept before compacting the read buffer
+MIN_COMMAND_GAP = 0.05  # Minimum spacing between commands to avoid overwhelming the device
+REQUEST_ID_LIMIT = 300000  # Request IDs wrap before reaching this
+REQUEST_ID_WIDTH = len(str(REQUEST_ID_LIMIT - 1))  # Digits in the largest request ID
+CONNECT_READY_TIMEOUT = 0.2  # Longest wait for the device to answer after opening the port
+
+# Linux serial ioctls (used when pyserial lacks set_low_latency_mode)
+TIOCGSERIAL = 0x541E
+TIOCSSERIAL = 0x541F
+ASYNC_LOW_LATENCY = 0x2000
+
+
+def _crc_update_bitwise(crc: int, byte: int) -> int:
+    """Bitwise CRC16 update for a single byte (reflected CCITT, poly 0x8408)"""
+    data = byte
+    data ^= crc & 0xff
+    data ^= (data & 0x0f) << 4
+    data &= 0xff
+    return (((data << 8) | (crc >> 8)) ^ (data >> 4) ^ (data << 3)) & 0xFFFF
+
 
+# Byte-at-a-time lookup table derived from the bitwise update above
+# (equivalent to CRC-16/MCRF4XX, check value 0x6F91 for b"123456789")
+_CRC_TABLE = tuple(_crc_update_bitwise(0, i) for i in range(256))
 
-def calc_crc(buffer: bytes) -> int:
+
+def _build_slice_tables(count: int) -> Tuple[Tuple[int, ...], ...]:
     """
-    Calculate CRC16 for ACE protocol.
+    Build slice-by-N tables, where table k advances the CRC over k extra zero bytes.
+
+    Args:
+        count: Number of tables (bytes processed per step)
+
+    Returns:
+        Tuple of lookup tables, table 0 being _CRC_TABLE
+    """
+    tables = [_CRC_TABLE]
+    for _ in range(1, count):
+        prev = tables[-1]
+        tables.append(tuple((prev[i] >> 8) ^ _CRC_TABLE[prev[i] & 0xFF] for i in range(256)))
+    return tuple(tables)
+
+
+_CRC_SLICE_TABLES = _build_slice_tables(8)
+
+# Below this size the per-step overhead of slice-by-8 outweighs the savings
+_CRC_SLICE_MIN_LEN = 32
+
+
+def _calc_crc_py(buffer: bytes, _tables=_CRC_SLICE_TABLES) -> int:
+    """
+    Calculate CRC16 for ACE protocol in pure Python.
+
+    Processes 8 bytes per step (slice-by-8) for longer buffers and falls
+    back to byte-at-a-time for short buffers and the remaining tail.
 
     Args:
         buffer: Payload bytes to calculate CRC for
@@ -42,13 +110,60 @@ def calc_crc(buffer: bytes) -> int:
     Returns:
         CRC16 value
     """
-    _crc = CRC_INIT_VALUE
-    for byte in buffer:
-        data = byte
-        data ^= _crc & 0xff
-        data ^= (data & 0x0f) << 4
-        _crc = ((data << 8) | (_crc >> 8)) ^ (data >> 4) ^ (data << 3)
-    return _crc
+    t0, t1, t2, t3, t4, t5, t6, t7 = _tables
+    crc = CRC_INIT_VALUE
+
+    tail = 0
+    if len(buffer) >= _CRC_SLICE_MIN_LEN:
+        tail = len(buffer) - len(buffer) % 8
+        it = iter(buffer[:tail])
+        for b0, b1, b2, b3, b4, b5, b6, b7 in zip(it, it, it, it, it, it, it, it):
+            crc ^= b0 | (b1 << 8)
+            crc = (t7[crc & 0xFF] ^ t6[crc >> 8] ^ t5[b2] ^ t4[b3] ^
+                   t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+
+    for byte in buffer[tail:]:
+        crc = (crc >> 8) ^ t0[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def _load_native_crc():
+    """
+    Build a native CRC16 function with crcmod, if it is installed.
+
+    Returns:
+        CRC function, or None if crcmod is unavailable or disagrees with _calc_crc_py
+    """
+    if crcmod is None:
+        return None
+
+    try:
+        native_crc = crcmod.mkCrcFun(0x11021, initCrc=CRC_INIT_VALUE, rev=True, xorOut=0)
+    except Exception as e:
+        logging.debug(f"AFC_ACE: crcmod unusable, using Python CRC16: {e}")
+        return None
+
+    # Only switch over if it produces the same checksums
+    for sample in (b"123456789", bytes(range(256))):
+        if native_crc(sample) != _calc_crc_py(sample):
+            logging.warning("AFC_ACE: crcmod CRC16 mismatch, using Python CRC16")
+            return None
+
+    return native_crc
+
+
+calc_crc = _load_native_crc() or _calc_crc_py
+
+
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    def _json_loads(data) -> Any:
+        return json.loads(bytes(data))
 
 
 class AcePacket:
@@ -61,7 +176,7 @@ class AcePacket:
     - HEAD: 0xFF 0xAA (2 bytes)
     - LEN: Payload length (2 bytes, little-endian)
     - PAYLOAD: JSON-encoded request/response
-    - CRC: CRC16 of payload (2 bytes)
+    - CRC: CRC16 of payload (2 bytes, little-endian)
     - TAIL: 0xFE (1 byte)
     """
 
@@ -76,89 +191,161 @@ class AcePacket:
         Returns:
             Encoded packet bytes ready to send over serial
         """
-        payload = json.dumps(request).encode('utf-8')
+        return b''.join(AcePacket.encode_parts(request))
+
+    @staticmethod
+    def encode_parts(request: Dict[str, Any]) -> List[bytes]:
+        """
+        Encode JSON request as the separate pieces of an ACE protocol packet.
+
+        Lets the packet be written with a single scatter write instead of
+        joining it into one buffer first.
+
+        Args:
+            request: Dictionary containing JSON-RPC request
+
+        Returns:
+            List of header, length, payload, CRC and tail bytes
+        """
+        payload = _json_dumps(request)
 
-        data = PROTOCOL_HEAD_BYTES
-        data += struct.pack('@H', len(payload))
-        data += payload
-        data += struct.pack('@H', calc_crc(payload))
-        data += bytes([PROTOCOL_TAIL_BYTE])
+        return [
+            PROTOCOL_HEAD_BYTES,
+            len(payload).to_bytes(2, 'little'),
+            payload,
+            calc_crc(payload).to_bytes(2, 'little'),
+            PROTOCOL_TAIL,
+        ]
 
-        return data
+    @staticmethod
+    def build_template(method: str) -> Tuple[bytearray, int]:
+        """
+        Build a reusable packet for a parameterless request.
+
+        The ID is right-aligned in a fixed-width field padded with spaces
+        (still valid JSON), so later requests only patch the ID and CRC.
+
+        Args:
+            method: JSON-RPC method name
+
+        Returns:
+            Tuple of (packet template, offset of the ID field)
+        """
+        prefix = b'{"id":'
+        payload = b''.join((prefix, b' ' * REQUEST_ID_WIDTH, b',"method":', _json_dumps(method), b'}'))
+
+        template = bytearray(b''.join((
+            PROTOCOL_HEAD_BYTES,
+            len(payload).to_bytes(2, 'little'),
+            payload,
+            b'\x00\x00',  # CRC, filled in per request
+            PROTOCOL_TAIL,
+        )))
+        return template, 4 + len(prefix)
 
     @staticmethod
-    def decode(buffer: bytes) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    def fill_template(template: bytearray, id_offset: int, request_id: int) -> bytearray:
+        """
+        Patch a request ID and matching CRC into a packet template in place.
+
+        Args:
+            template: Packet template from build_template()
+            id_offset: Offset of the ID field
+            request_id: Request ID to write
+
+        Returns:
+            The same template, ready to send
+        """
+        template[id_offset:id_offset + REQUEST_ID_WIDTH] = b'%*d' % (REQUEST_ID_WIDTH, request_id)
+        crc_offset = len(template) - 3
+        template[crc_offset:crc_offset + 2] = calc_crc(memoryview(template)[4:crc_offset]).to_bytes(2, 'little')
+        return template
+
+    @staticmethod
+    def decode(buffer) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
         Decode ACE protocol packet to JSON response.
 
         Args:
-            buffer: Raw bytes received from serial port
+            buffer: Raw bytes received from serial port (bytes, bytearray or memoryview)
 
         Returns:
             Tuple of (decoded_response, error_message)
             If successful, error_message is None
         """
+        # Parse through a memoryview so header/CRC checks don't copy
+        mv = memoryview(buffer)
+
         # Check minimum packet size
-        if len(buffer) < PROTOCOL_MIN_PACKET_SIZE:
-            return None, f"Packet too small: {len(buffer)} < {PROTOCOL_MIN_PACKET_SIZE}"
+        if len(mv) < PROTOCOL_MIN_PACKET_SIZE:
+            return None, f"Packet too small: {len(mv)} < {PROTOCOL_MIN_PACKET_SIZE}"
 
         # Validate header
-        if buffer[0:2] != PROTOCOL_HEAD_BYTES:
-            return None, f"Invalid protocol header: {buffer[0:2].hex()}"
+        if mv[0] != PROTOCOL_HEAD_BYTES[0] or mv[1] != PROTOCOL_HEAD_BYTES[1]:
+            return None, f"Invalid protocol header: {mv[0:2].hex()}"
 
         # Extract payload length
-        payload_len = struct.unpack('<H', buffer[2:4])[0]
+        payload_len = struct.unpack_from('<H', mv, 2)[0]
 
         # Check if we have complete packet
         expected_len = 4 + payload_len + 2 + 1  # header + len + payload + crc + tail
-        if len(buffer) < expected_len:
-            return None, f"Incomplete packet: expected {expected_len}, got {len(buffer)}"
+        if len(mv) < expected_len:
+            return None, f"Incomplete packet: expected {expected_len}, got {len(mv)}"
 
         # Extract payload
-        payload = buffer[4:4 + payload_len]
+        payload = mv[4:4 + payload_len]
 
         # Validate CRC
-        crc_data = buffer[4 + payload_len:4 + payload_len + 2]
-        crc_calculated = struct.pack('@H', calc_crc(payload))
+        crc_received = struct.unpack_from('<H', mv, 4 + payload_len)[0]
+        crc_calculated = calc_crc(payload)
 
-        if crc_data != crc_calculated:
-            return None, f"CRC mismatch: expected {crc_calculated.hex()}, got {crc_data.hex()}"
+        if crc_received != crc_calculated:
+            return None, f"CRC mismatch: expected {crc_calculated:04X}, got {crc_received:04X}"
 
         # Validate tail byte
-        tail_byte = buffer[4 + payload_len + 2]
+        tail_byte = mv[4 + payload_len + 2]
         if tail_byte != PROTOCOL_TAIL_BYTE:
             return None, f"Invalid tail byte: {tail_byte:02X}"
 
-        # Decode JSON payload
+        # Decode JSON payload (orjson reads the memoryview without copying)
         try:
-            response = json.loads(payload.decode('utf-8'))
+            response = _json_loads(payload)
             return response, None
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        except ValueError as e:
             return None, f"JSON decode error: {e}"
 
     @staticmethod
-    def find_packet_in_buffer(buffer: bytearray) -> Tuple[Optional[bytes], bytearray]:
+    def peek_id(packet: bytes) -> Optional[int]:
         """
-        Search for a complete packet in a buffer.
+        Read the request ID from a packet without JSON-decoding it.
+
+        Only looks at the first "id" key in the payload, so it can be fooled
+        by a nested "id" that comes before the top-level one.
 
         Args:
-            buffer: Accumulated bytes from serial reads
+            packet: Complete packet bytes
 
         Returns:
-            Tuple of (packet_bytes, remaining_buffer)
-            If no complete packet found, returns (None, buffer)
+            Integer ID, or None if it can't be found cheaply
         """
-        # Look for tail byte (end of packet marker)
-        tail_index = buffer.find(PROTOCOL_TAIL_BYTE)
+        if len(packet) < PROTOCOL_MIN_PACKET_SIZE:
+            return None
+
+        payload_end = 4 + struct.unpack_from('<H', packet, 2)[0]
+        key = packet.find(b'"id"', 4, payload_end)
+        if key < 0:
+            return None
 
-        if tail_index >= 0:
-            # Found potential packet - extract it
-            packet = bytes(buffer[:tail_index + 1])
-            remaining = bytearray(buffer[tail_index + 1:])
-            return packet, remaining
+        pos = key + 4
+        while pos < payload_end and packet[pos] in b' \t:':
+            pos += 1
+        end = pos
+        while end < payload_end and 0x30 <= packet[end] <= 0x39:
+            end += 1
+        if end == pos:
+            return None
 
-        # No complete packet yet
-        return None, buffer
+        return int(packet[pos:end])
 
 
 class AceProtocol:
@@ -167,7 +354,8 @@ class AceProtocol:
     Manages serial communication and command execution.
     """
 
-    def __init__(self, port: str, baud: int = DEFAULT_BAUD_RATE, timeout: float = DEFAULT_TIMEOUT):
+    def __init__(self, port: str, baud: int = DEFAULT_BAUD_RATE, timeout: float = DEFAULT_TIMEOUT,
+                 low_latency: bool = False, match_response_id: bool = False):
         """
         Initialize ACE protocol handler.
 
@@ -175,14 +363,25 @@ class AceProtocol:
             port: Serial port path (e.g., '/dev/ttyACM0' or '/dev/serial/by-path/...')
             baud: Baud rate (default 115200)
             timeout: Serial timeout in seconds
+            low_latency: Set ASYNC_LOW_LATENCY on the port after connecting (Linux only)
+            match_response_id: Drop responses whose ID doesn't match the request
+                               before JSON-decoding them
         """
         self.port = port
         self.baud = baud
         self.timeout = timeout
+        self.low_latency = low_latency
+        self.match_response_id = match_response_id
         self.serial = None
         self._request_id = 0
         self.read_buffer = bytearray()
+        self._read_offset = 0  # Start of unconsumed data in read_buffer
         self._lock = threading.Lock()  # Thread-safe access to serial port
+        self._selector = None  # Waits for incoming data instead of sleep-polling
+        self._write_fd = None  # Raw fd for scatter writes, None to use serial.write
+        self._ready_probe_id = None  # ID of an unanswered readiness probe from connect()
+        self._packet_templates = {}  # {method: (template, id_offset)} for parameterless requests
+        self._last_command_time = 0.0
 
     def connect(self) -> bool:
         """
@@ -211,27 +410,256 @@ class AceProtocol:
             self.serial.reset_input_buffer()
             self.serial.reset_output_buffer()
             self.read_buffer = bytearray()
+            self._read_offset = 0
+
+            if self.low_latency:
+                self.set_low_latency()
+
+            self._open_selector()
+            self._write_fd = self._get_write_fd()
 
             logging.info(f"AFC_ACE: Connected to {self.port} at {self.baud} baud")
 
             # Give device time to stabilize after connection
-            import time
-            time.sleep(0.2)  # Increased from 0.1s to 0.2s
+            self._wait_until_ready()
 
             return True
         except serial.SerialException as e:
             logging.error(f"AFC_ACE: Failed to connect to {self.port}: {e}")
             return False
 
+    def _wait_until_ready(self, timeout: float = CONNECT_READY_TIMEOUT):
+        """
+        Send a get_info probe and wait for the device to start answering.
+
+        Returns as soon as a packet arrives, or after the timeout either way
+        since a device may stay silent until its first real command.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+        """
+        request = {"id": self._get_next_request_id(), "method": "get_info"}
+        self._ready_probe_id = request["id"]
+
+        try:
+            self._write_parts(AcePacket.encode_parts(request))
+            self.serial.flush()
+
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                waiting = self.serial.in_waiting
+                if waiting:
+                    self.read_buffer += self.serial.read(waiting)
+                    packet_bytes = self._try_extract_packet()
+                    if packet_bytes:
+                        if AcePacket.peek_id(packet_bytes) == self._ready_probe_id:
+                            self._ready_probe_id = None
+                        return
+                self._wait_for_data(deadline - time.monotonic())
+
+            logging.debug(f"AFC_ACE: No reply from {self.port} within {timeout}s of connecting")
+        except serial.SerialException as e:
+            logging.debug(f"AFC_ACE: Readiness probe on {self.port} failed: {e}")
+        finally:
+            self._last_command_time = time.monotonic()
+
+    def _encode_from_template(self, method: str, request_id: int) -> bytearray:
+        """
+        Encode a parameterless request by patching a cached packet template.
+
+        Args:
+            method: JSON-RPC method name
+            request_id: Request ID
+
+        Returns:
+            Packet bytes; only valid until the next request for the same method
+        """
+        cached = self._packet_templates.get(method)
+        if cached is None:
+            cached = self._packet_templates[method] = AcePacket.build_template(method)
+        return AcePacket.fill_template(cached[0], cached[1], request_id)
+
+    def _is_probe_response(self, response: Optional[Dict[str, Any]]) -> bool:
+        """Check for (and consume) a late reply to the connect() readiness probe"""
+        if response and self._ready_probe_id is not None and response.get('id') == self._ready_probe_id:
+            self._ready_probe_id = None
+            return True
+        return False
+
+    def set_low_latency(self) -> bool:
+        """
+        Enable the kernel low-latency flag on the open serial port.
+
+        Without it the tty layer may hold replies for up to 16ms before
+        handing them to userspace.
+
+        Returns:
+            True if the flag was set, False if unsupported
+        """
+        if not self.serial or not self.serial.is_open:
+            return False
+
+        try:
+            self.serial.set_low_latency_mode(True)
+            return True
+        except (IOError, AttributeError, ValueError, NotImplementedError) as e:
+            logging.debug(f"AFC_ACE: pyserial low latency mode unavailable on {self.port}: {e}")
+
+        # Fall back to the raw ioctl on older pyserial releases
+        try:
+            import array
+            import fcntl
+            buf = array.array('i', [0] * 32)
+            fcntl.ioctl(self.serial.fileno(), TIOCGSERIAL, buf)
+            buf[4] |= ASYNC_LOW_LATENCY
+            fcntl.ioctl(self.serial.fileno(), TIOCSSERIAL, buf)
+            return True
+        except (IOError, OSError, ImportError, AttributeError, ValueError) as e:
+            logging.info(f"AFC_ACE: Low latency mode not supported on {self.port}: {e}")
+            return False
+
+    def _open_selector(self):
+        """Register the serial port with a selector (epoll on Linux) if possible"""
+        self._close_selector()
+        try:
+            selector = selectors.DefaultSelector()
+            selector.register(self.serial.fileno(), selectors.EVENT_READ)
+            self._selector = selector
+        except (AttributeError, ValueError, OSError) as e:
+            # e.g. Windows, where serial handles can't be selected
+            logging.debug(f"AFC_ACE: Falling back to polled reads on {self.port}: {e}")
+
+    def _get_write_fd(self) -> Optional[int]:
+        """Get the serial fd for os.writev, or None where that isn't possible"""
+        if not hasattr(os, 'writev'):
+            return None
+        try:
+            return self.serial.fileno()
+        except (AttributeError, ValueError, OSError):
+            return None
+
+    def _write_parts(self, parts: List[bytes]):
+        """
+        Write packet pieces to the serial port in as few syscalls as possible.
+
+        Args:
+            parts: Byte strings to write back to back
+
+        Raises:
+            serial.SerialException: On write errors, like serial.write()
+        """
+        fd = self._write_fd
+        if fd is None:
+            self.serial.write(b''.join(parts))
+            return
+
+        # pyserial opens the port non-blocking, so handle EAGAIN and short writes
+        parts = list(parts)
+        while parts:
+            try:
+                written = os.writev(fd, parts)
+            except BlockingIOError:
+                _, ready, _ = select.select([], [fd], [], self.timeout)
+                if not ready:
+                    raise serial.SerialTimeoutException("Write timeout")
+                continue
+            except InterruptedError:
+                continue
+            except OSError as e:
+                raise serial.SerialException(f"write failed: {e}")
+
+            while parts and written >= len(parts[0]):
+                written -= len(parts[0])
+                parts.pop(0)
+            if written:
+                parts[0] = parts[0][written:]
+
+    def _close_selector(self):
+        """Release the selector, if any"""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+
+    def _wait_for_data(self, timeout: float):
+        """
+        Wait until the serial port has data to read or the timeout expires.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+        """
+        timeout = max(0.0, timeout)
+        if self._selector is not None:
+            self._selector.select(timeout)
+        else:
+            time.sleep(min(timeout, 0.05))
+
+    def _try_extract_packet(self) -> Optional[bytes]:
+        """
+        Take the next complete packet from the read buffer.
+
+        Packets are framed by header and length field, so a tail byte value
+        inside the length or CRC doesn't split a packet. Consumed bytes are
+        only tracked by offset and dropped in bulk once enough accumulate.
+
+        Returns:
+            Packet bytes, or None if no complete packet is buffered yet
+        """
+        buf = self.read_buffer
+        while True:
+            start = buf.find(PROTOCOL_HEAD_BYTES, self._read_offset)
+            if start < 0:
+                # Skip garbage, keeping a trailing byte that may start a header
+                self._read_offset = max(self._read_offset, len(buf) - 1)
+                packet = None
+                break
+
+            self._read_offset = start
+            if len(buf) - start < 4:
+                packet = None
+                break
+
+            payload_len = struct.unpack_from('<H', buf, start + 2)[0]
+            if payload_len > MAX_PAYLOAD_SIZE:
+                logging.warning(f"AFC_ACE: Discarding bogus packet header (length {payload_len})")
+                self._read_offset = start + 1
+                continue
+
+            end = start + 4 + payload_len + 2 + 1  # header + len + payload + crc + tail
+            if len(buf) < end:
+                packet = None
+                break
+
+            packet = bytes(buf[start:end])
+            self._read_offset = end
+            break
+
+        if self._read_offset >= len(buf):
+            buf.clear()
+            self._read_offset = 0
+        elif self._read_offset > READ_BUFFER_COMPACT_SIZE:
+            del buf[:self._read_offset]
+            self._read_offset = 0
+
+        return packet
+
+    def _wait_command_gap(self):
+        """Sleep only as long as needed to keep MIN_COMMAND_GAP since the last command"""
+        remaining = MIN_COMMAND_GAP - (time.monotonic() - self._last_command_time)
+        if remaining > 0:
+            time.sleep(remaining)
+
     def disconnect(self):
         """Close serial connection"""
+        self._close_selector()
+        self._write_fd = None
+        self._ready_probe_id = None
         if self.serial and self.serial.is_open:
             self.serial.close()
             logging.info(f"AFC_ACE: Disconnected from {self.port}")
 
     def _get_next_request_id(self) -> int:
         """Generate next request ID"""
-        self._request_id = (self._request_id + 1) % 300000
+        self._request_id = (self._request_id + 1) % REQUEST_ID_LIMIT
         return self._request_id
 
     def send_command(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = REQUEST_TIMEOUT) -> Optional[Dict[str, Any]]:
@@ -251,50 +679,71 @@ class AceProtocol:
                 logging.error("AFC_ACE: Serial port not open")
                 return None
 
-            # Build request
-            request = {
-                "id": self._get_next_request_id(),
-                "method": method
-            }
+            # Encode request (polled parameterless commands reuse a prebuilt packet)
+            request_id = self._get_next_request_id()
             if params:
-                request["params"] = params
-
-            # Encode and send
-            packet = AcePacket.encode(request)
+                parts = AcePacket.encode_parts({
+                    "id": request_id,
+                    "method": method,
+                    "params": params
+                })
+            else:
+                parts = [self._encode_from_template(method, request_id)]
 
             try:
-                # Small delay before sending to prevent overwhelming device
-                import time
-                time.sleep(0.05)
-
-                self.serial.write(packet)
-                self.serial.flush()
+                # Keep a small gap between commands to prevent overwhelming device
+                self._wait_command_gap()
+
+                ser = self.serial
+                self._write_parts(parts)
+                ser.flush()
+
+                # Bind hot-loop lookups once; the loop can spin for the whole timeout
+                read_buffer = self.read_buffer
+                ser_read = ser.read
+                extract = self._try_extract_packet
+                wait_for_data = self._wait_for_data
+                decode = AcePacket.decode
+                peek_id = AcePacket.peek_id if self.match_response_id else None
+                monotonic = time.monotonic
 
                 # Wait for response
-                import time
-                start_time = time.time()
-
-                while (time.time() - start_time) < timeout:
-                    if self.serial.in_waiting > 0:
-                        self.read_buffer += self.serial.read(self.serial.in_waiting)
+                deadline = monotonic() + timeout
 
-                        # Try to extract packet
-                        packet_bytes, self.read_buffer = AcePacket.find_packet_in_buffer(self.read_buffer)
+                while monotonic() < deadline:
+                    waiting = ser.in_waiting
+                    if waiting:
+                        read_buffer += ser_read(waiting)
 
-                        if packet_bytes:
-                            response, error = AcePacket.decode(packet_bytes)
+                    # Try to extract packet
+                    packet_bytes = extract()
 
-                            if error:
-                                logging.warning(f"AFC_ACE: Packet decode error: {error}")
+                    if packet_bytes:
+                        if peek_id is not None:
+                            response_id = peek_id(packet_bytes)
+                            if response_id is not None and response_id != request_id:
+                                logging.debug(f"AFC_ACE: Dropping response for request {response_id}")
                                 continue
 
-                            if response and 'result' in response:
-                                return response['result']
-                            elif response and 'error' in response:
-                                logging.error(f"AFC_ACE: Command error: {response['error']}")
-                                return None
+                        response, error = decode(packet_bytes)
+
+                        if error:
+                            logging.warning(f"AFC_ACE: Packet decode error: {error}")
+                            continue
+
+                        if self._is_probe_response(response):
+                            continue
 
-                    time.sleep(0.05)
+                        if response and 'result' in response:
+                            return response['result']
+                        elif response and 'error' in response:
+                            logging.error(f"AFC_ACE: Command error: {response['error']}")
+                            return None
+
+                        # Drain any further buffered packets before waiting
+                        continue
+
+                    wait_for_data(deadline - monotonic())
 
                 logging.warning(f"AFC_ACE: Command '{method}' timed out after {timeout}s")
                 return None
@@ -310,25 +759,23 @@ class AceProtocol:
                         logging.info(f"AFC_ACE: Reconnected successfully, retrying command")
                         # Retry command once after reconnection
                         try:
-                            packet = AcePacket.encode(request)
-                            self.serial.write(packet)
+                            self._write_parts(parts)
                             self.serial.flush()
 
-                            import time
-                            start_time = time.time()
-                            while (time.time() - start_time) < timeout:
+                            deadline = time.monotonic() + timeout
+                            while time.monotonic() < deadline:
                                 if self.serial.in_waiting > 0:
                                     self.read_buffer += self.serial.read(self.serial.in_waiting)
-                                    packet_bytes, self.read_buffer = AcePacket.find_packet_in_buffer(self.read_buffer)
+                                    packet_bytes = self._try_extract_packet()
                                     if packet_bytes:
                                         response, error = AcePacket.decode(packet_bytes)
-                                        if error:
+                                        if error or self._is_probe_response(response):
                                             continue
                                         if response and 'result' in response:
                                             return response['result']
                                         elif response and 'error' in response:
                                             return None
-                                time.sleep(0.05)
+                                self._wait_for_data(deadline - time.monotonic())
                         except Exception as retry_error:
                             logging.error(f"AFC_ACE: Retry after reconnect failed: {retry_error}")
                     else:
@@ -336,6 +783,105 @@ class AceProtocol:
 
                 return None
 
+            finally:
+                # Gap is measured from the end of the command
+                self._last_command_time = time.monotonic()
+
+    def send_commands(self, commands: List[Tuple[str, Optional[Dict[str, Any]]]],
+                      timeout: float = REQUEST_TIMEOUT) -> List[Optional[Dict[str, Any]]]:
+        """
+        Send several JSON-RPC commands in a single write and collect responses.
+
+        Responses are matched to requests by ID, so the device may answer
+        in any order.
+
+        Args:
+            commands: List of (method, params) tuples
+            timeout: Timeout in seconds for the whole batch
+
+        Returns:
+            List of response dictionaries (None for failed/missing responses),
+            in the same order as commands
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(commands)
+        if not commands:
+            return results
+
+        with self._lock:  # Ensure thread-safe serial access
+            if not self.serial or not self.serial.is_open:
+                logging.error("AFC_ACE: Serial port not open")
+                return results
+
+            pending = {}
+            parts = []
+            for position, (method, params) in enumerate(commands):
+                request = {
+                    "id": self._get_next_request_id(),
+                    "method": method
+                }
+                if params:
+                    request["params"] = params
+                pending[request["id"]] = (position, method)
+                parts += AcePacket.encode_parts(request)
+
+            try:
+                self._wait_command_gap()
+
+                self._write_parts(parts)
+                self.serial.flush()
+
+                deadline = time.monotonic() + timeout
+                while pending and time.monotonic() < deadline:
+                    if self.serial.in_waiting > 0:
+                        self.read_buffer += self.serial.read(self.serial.in_waiting)
+
+                        while pending:
+                            packet_bytes = self._try_extract_packet()
+                            if not packet_bytes:
+                                break
+
+                            response, error = AcePacket.decode(packet_bytes)
+                            if error:
+                                logging.warning(f"AFC_ACE: Packet decode error: {error}")
+                                continue
+
+                            entry = pending.pop(response.get('id'), None) if response else None
+                            if entry is None:
+                                continue
+
+                            position, method = entry
+                            if 'result' in response:
+                                results[position] = response['result']
+                            elif 'error' in response:
+                                logging.error(f"AFC_ACE: Command '{method}' error: {response['error']}")
+                        continue
+
+                    self._wait_for_data(deadline - time.monotonic())
+
+                for position, method in pending.values():
+                    logging.warning(f"AFC_ACE: Command '{method}' timed out after {timeout}s")
+
+            except serial.SerialException as e:
+                logging.error(f"AFC_ACE: Serial error during batched commands: {e}")
+
+            finally:
+                self._last_command_time = time.monotonic()
+
+        return results
+
+    def probe_multi_command(self) -> bool:
+        """
+        Check whether the device answers several requests sent in one write.
+
+        Sends two get_info requests with send_commands and checks that a
+        response comes back for each of them.
+
+        Returns:
+            True if both requests were answered
+        """
+        results = self.send_commands([("get_info", None), ("get_info", None)])
+        return all(result is not None for result in results)
+
     # ============================================================
     # ACE Commands
     # ============================================================
@@ -386,6 +932,38 @@ class AceProtocol:
         })
         return result is not None
 
+    def feed_multi(self, ops: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Feed/retract several slots with a single serial write.
+
+        Args:
+            ops: List of dicts with 'index', 'length' (mm, negative=retract),
+                 'speed' and optional 'assist' keys
+
+        Returns:
+            List of success flags, one per op
+        """
+        commands = []
+        move_positions = []
+        for op in ops:
+            index = op['index']
+            length = op['length']
+            if length > 0:
+                if op.get('assist'):
+                    commands.append(("feed_assist", {"index": index}))
+                method = "feed"
+            else:
+                method = "back"
+            move_positions.append(len(commands))
+            commands.append((method, {
+                "index": index,
+                "len": int(abs(length)),
+                "speed": op['speed']
+            }))
+
+        results = self.send_commands(commands)
+        return [results[position] is not None for position in move_positions]
+
     def set_feed_assist(self, index: int, enable: bool) -> bool:
         """
         Enable/disable feed assist for a lane.
@@ -77,6 +77,27 @@ if [ $? -ne 0 ]; then
     print_warning "pyserial not found, installing..."
     pip3 install --user pyserial
 fi
+
+# Optional: crcmod provides a native packet checksum (pure Python fallback otherwise)
+python3 -c "import crcmod" 2>/dev/null
+if [ $? -ne 0 ]; then
+    print_warning "crcmod not found, installing (optional)..."
+    pip3 install --user crcmod || print_warning "crcmod install failed, using built-in CRC"
+fi
+
+# Optional: orjson speeds up packet encode/decode (standard json fallback otherwise)
+python3 -c "import orjson" 2>/dev/null
+if [ $? -ne 0 ]; then
+    print_warning "orjson not found, installing (optional)..."
+    pip3 install --user orjson || print_warning "orjson install failed, using built-in json"
+fi
+
+# Optional: pyudev refreshes device discovery on USB hotplug (timed rescans otherwise)
+python3 -c "import pyudev" 2>/dev/null
+if [ $? -ne 0 ]; then
+    print_warning "pyudev not found, installing (optional)..."
+    pip3 install --user pyudev || print_warning "pyudev install failed, using timed rescans"
+fi
 print_status "Python dependencies installed"
 
 echo ""
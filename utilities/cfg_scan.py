@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+AFC-ACE Config Scanning Helpers
+Shared by check_config.py and diagnose_afc.py
+"""
+
+import os
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Below this many files, thread startup costs more than it saves
+PARALLEL_MIN_FILES = 8
+
+# Per-file scan results are kept here between runs
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'afc_diag')
+CACHE_MAX_ENTRIES = 4096
+# Bumped when the layout of the cache file changes
+CACHE_FORMAT = 2
+
+def iter_cfg_files(path):
+    """
+    Yield an os.DirEntry for each .cfg file under path, recursively
+
+    Uses os.scandir directly so file types come from the directory listing
+    instead of a stat per entry, and the entries keep any stat they did make
+    for scan_cfg_files to reuse. Hidden directories (.git, .cache, ...) are
+    skipped, and like os.walk, symlinked directories aren't followed while
+    symlinked files are included.
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            yield from iter_cfg_files(entry.path)
+                    elif entry.name.endswith('.cfg') and entry.is_file():
+                        yield entry
+                except OSError:
+                    pass
+    except OSError:
+        # Unreadable directory; os.walk skips these silently too
+        pass
+
+def map_cfg_files(func, paths):
+    """
+    Yield (path, func(path)) for each path, as each one finishes
+
+    Reading and scanning files is mostly waiting on I/O, so larger trees
+    are spread over a thread pool; small ones are handled inline. Results
+    are not in path order; callers that print them sort the final lists.
+    """
+    paths = list(paths)
+    if len(paths) <= PARALLEL_MIN_FILES:
+        for path in paths:
+            yield path, func(path)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        futures = {executor.submit(func, path): path for path in paths}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+class ScanCache:
+    """
+    Per-file scan results persisted between runs
+
+    A result is reused while the file's mtime, size and ctime are unchanged
+    (ctime also catches permission fixes on files that failed to read).
+    version identifies what produced the results; a cache written with a
+    different version is ignored. The least recently used entries are
+    dropped beyond CACHE_MAX_ENTRIES.
+
+    The cache is shared by runs from any directory, so entries are keyed on
+    the absolute path. Results contain the path the file was scanned as, so
+    a result is only reused when that path is the same too.
+    """
+
+    def __init__(self, name, version):
+        self.path = os.path.join(CACHE_DIR, f"{name}.json")
+        self.version = version
+        self.entries = OrderedDict()
+        self.dirty = False
+        self.cwd = os.getcwd()
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == version and data.get('format') == CACHE_FORMAT:
+                self.entries = OrderedDict(data.get('files', {}))
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _key(self, filepath):
+        """Returns the absolute path used to key filepath's entry"""
+        return os.path.normpath(os.path.join(self.cwd, filepath))
+
+    def get(self, filepath, st):
+        """Return the cached result for filepath if its stat still matches, else None"""
+        key = self._key(filepath)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != [st.st_mtime_ns, st.st_size, st.st_ctime_ns] or entry[1] != filepath:
+            return None
+        self.entries.move_to_end(key)
+        return entry[2]
+
+    def put(self, filepath, st, result):
+        """Store the result for filepath as of stat st"""
+        key = self._key(filepath)
+        self.entries[key] = [[st.st_mtime_ns, st.st_size, st.st_ctime_ns], filepath, result]
+        self.entries.move_to_end(key)
+        while len(self.entries) > CACHE_MAX_ENTRIES:
+            self.entries.popitem(last=False)
+        self.dirty = True
+
+    def save(self):
+        """Write the cache back atomically, if anything changed"""
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': self.version, 'format': CACHE_FORMAT, 'files': self.entries}, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            # A cache we can't write just means a full scan next time
+            pass
+
+    def clear(self):
+        """Forget all cached results, on disk too"""
+        self.entries.clear()
+        self.dirty = False
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+def add_cache_arguments(parser):
+    """Add the --no-cache and --clear-cache options to an argparse parser"""
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Rescan every file instead of reusing results from earlier runs'
+    )
+    parser.add_argument(
+        '--clear-cache',
+        action='store_true',
+        help='Delete cached scan results before scanning'
+    )
+
+def open_cache(name, version, args):
+    """Get the ScanCache for a script, or None if caching is turned off"""
+    if args.no_cache and not args.clear_cache:
+        return None
+    cache = ScanCache(name, version)
+    if args.clear_cache:
+        cache.clear()
+    return None if args.no_cache else cache
+
+def scan_cfg_files(func, entries, cache=None):
+    """
+    Yield (path, func(path)) for each entry from iter_cfg_files, reusing
+    cached results for files that haven't changed since they were cached
+
+    Cached results come first, then the changed files as they are scanned
+    (on a thread pool for larger trees, see map_cfg_files). The cache is
+    checked against each entry's own stat, which the directory walk may
+    already have made. Results must be JSON serializable.
+    """
+    if cache is None:
+        yield from map_cfg_files(func, [entry.path for entry in entries])
+        return
+
+    stats = {}
+    misses = []
+    for entry in entries:
+        filepath = entry.path
+        try:
+            st = entry.stat()
+        except OSError:
+            misses.append(filepath)
+            continue
+
+        cached = cache.get(filepath, st)
+        if cached is None:
+            stats[filepath] = st
+            misses.append(filepath)
+        else:
+            yield filepath, cached
+
+    for filepath, result in map_cfg_files(func, misses):
+        if filepath in stats:
+            cache.put(filepath, stats[filepath], result)
+        yield filepath, result
+
+    cache.save()
@@ -7,74 +7,97 @@ Helps diagnose "AFC_hub not found" errors by scanning your config files
 import sys
 import os
 import re
+import argparse
 
-def check_config_file(filepath):
-    """
-    Check a single config file for hub references
-    Returns list of issues found
-    """
-    issues = []
+from cfg_scan import iter_cfg_files, scan_cfg_files, add_cache_arguments, open_cache
 
-    if not os.path.exists(filepath):
-        return [f"File not found: {filepath}"]
+# Precompiled line patterns
+_SECTION_RE = re.compile(r'\[([^\]]+)\]')
+_HUB_LINE_RE = re.compile(r'^\s*hub\s*:\s*(.*?)\s*$')
+_HUB_DEF_RE = re.compile(r'\[AFC_hub\s+([^\]]+)\]')
 
-    try:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
+# Cached results are only valid for the patterns that produced them
+_CACHE_VERSION = '\n'.join(pattern.pattern for pattern in (_SECTION_RE, _HUB_LINE_RE, _HUB_DEF_RE))
 
+def iter_hub_references(filepath, defined_hubs=None):
+    """
+    Yield an issue for each hub reference in a config file, as it is read
+    Errors opening or reading the file are raised to the caller
+
+    If defined_hubs is given, [AFC_hub <name>] definitions seen along the
+    way are recorded in it as {name: filepath} (first definition wins)
+    """
+    with open(filepath, 'r') as f:
         current_section = None
-        for line_num, line in enumerate(lines, 1):
+        for line_num, line in enumerate(f, 1):
+            # Most lines match none of the patterns, so cheap string
+            # checks decide whether a regex is worth running at all
+
             # Track current section
-            section_match = re.match(r'\[([^\]]+)\]', line)
-            if section_match:
-                current_section = section_match.group(1)
+            if line.startswith('['):
+                section_match = _SECTION_RE.match(line)
+                if section_match:
+                    current_section = section_match.group(1)
+
+            # Collect hub definitions in the same pass
+            if defined_hubs is not None and '[AFC_hub' in line:
+                for hub_match in _HUB_DEF_RE.finditer(line):
+                    defined_hubs.setdefault(hub_match.group(1), filepath)
 
             # Check for hub references (not commented out)
-            if re.match(r'^\s*hub\s*:', line):
-                hub_value = line.split(':', 1)[1].strip()
-                issues.append({
+            if not line.lstrip().startswith('hub'):
+                continue
+            hub_match = _HUB_LINE_RE.match(line)
+            if hub_match:
+                yield {
                     'file': filepath,
                     'line': line_num,
                     'section': current_section,
                     'content': line.strip(),
-                    'hub_name': hub_value
-                })
+                    'hub_name': hub_match.group(1)
+                }
+
+def check_config_file(filepath, defined_hubs=None):
+    """
+    Check a single config file for hub references
+    Returns list of issues found
 
+    If defined_hubs is given, [AFC_hub <name>] definitions seen along the
+    way are recorded in it as {name: filepath} (first definition wins)
+    """
+    try:
+        return list(iter_hub_references(filepath, defined_hubs))
+    except FileNotFoundError:
+        return [f"File not found: {filepath}"]
     except Exception as e:
         return [f"Error reading {filepath}: {e}"]
 
-    return issues
-
-def check_hub_definition(config_dir, hub_name):
+def _check_file_and_hubs(filepath):
     """
-    Check if a hub is actually defined
+    Run check_config_file on one file, keeping its hub definitions separate
+    so files can be checked in parallel
+    Returns (issues, {hub name: filepath})
     """
-    # Look for [AFC_hub <hub_name>] in all .cfg files
-    for root, dirs, files in os.walk(config_dir):
-        for file in files:
-            if file.endswith('.cfg'):
-                filepath = os.path.join(root, file)
-                try:
-                    with open(filepath, 'r') as f:
-                        content = f.read()
-                        if re.search(rf'\[AFC_hub\s+{hub_name}\]', content):
-                            return True, filepath
-                except:
-                    pass
-
-    return False, None
+    defined_hubs = {}
+    return check_config_file(filepath, defined_hubs), defined_hubs
 
 def main():
+    parser = argparse.ArgumentParser(description='AFC-ACE Config Checker')
+    parser.add_argument(
+        'config_dir',
+        nargs='?',
+        default=os.path.expanduser("~/printer_data/config"),
+        help='Klipper config directory (default: ~/printer_data/config)'
+    )
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
     print("=" * 70)
     print("AFC-ACE Config Checker")
     print("=" * 70)
     print()
 
-    # Default config directory
-    config_dir = os.path.expanduser("~/printer_data/config")
-
-    if len(sys.argv) > 1:
-        config_dir = sys.argv[1]
+    config_dir = args.config_dir
 
     if not os.path.exists(config_dir):
         print(f"❌ Config directory not found: {config_dir}")
@@ -90,26 +113,31 @@ def main():
     print()
 
     # Find all .cfg files
-    cfg_files = []
-    for root, dirs, files in os.walk(config_dir):
-        for file in files:
-            if file.endswith('.cfg'):
-                cfg_files.append(os.path.join(root, file))
+    cfg_entries = list(iter_cfg_files(config_dir))
 
-    print(f"📄 Found {len(cfg_files)} config files")
+    print(f"📄 Found {len(cfg_entries)} config files")
     print()
 
-    # Check each file for hub references
+    # Check each file for hub references, collecting hub definitions as we go
     all_issues = []
     hub_names = set()
+    defined_hubs = {}
+
+    cache = open_cache('check_config', _CACHE_VERSION, args)
+    for _, (issues, file_hubs) in scan_cfg_files(_check_file_and_hubs, cfg_entries, cache):
+        # Files finish in any order; report the first defining file by path
+        for hub_name, hub_file in file_hubs.items():
+            if hub_name not in defined_hubs or hub_file < defined_hubs[hub_name]:
+                defined_hubs[hub_name] = hub_file
 
-    for cfg_file in cfg_files:
-        issues = check_config_file(cfg_file)
         if issues and isinstance(issues[0], dict):
             all_issues.extend(issues)
             for issue in issues:
                 hub_names.add(issue['hub_name'])
 
+    # Sort only the collected issues, for a stable report
+    all_issues.sort(key=lambda issue: (issue['file'], issue['line']))
+
     # Report findings
     if not all_issues:
         print("✅ No hub references found in config files")
@@ -124,21 +152,25 @@ def main():
     print(f"⚠️  Found {len(all_issues)} hub reference(s):")
     print()
 
+    # Build each section's text and write it in one go
+    lines = []
     for issue in all_issues:
-        print(f"  File: {issue['file']}")
-        print(f"  Line {issue['line']}: {issue['content']}")
-        print(f"  Section: [{issue['section']}]")
-        print(f"  Hub name: '{issue['hub_name']}'")
+        lines.append(f"  File: {issue['file']}")
+        lines.append(f"  Line {issue['line']}: {issue['content']}")
+        lines.append(f"  Section: [{issue['section']}]")
+        lines.append(f"  Hub name: '{issue['hub_name']}'")
 
-        # Check if hub is defined
-        hub_defined, hub_file = check_hub_definition(config_dir, issue['hub_name'])
+        # Check if hub is defined (kept on the issue for the solutions below)
+        issue['hub_file'] = defined_hubs.get(issue['hub_name'])
+        issue['hub_defined'] = issue['hub_file'] is not None
 
-        if hub_defined:
-            print(f"  ✅ Hub IS defined in: {hub_file}")
+        if issue['hub_defined']:
+            lines.append(f"  ✅ Hub IS defined in: {issue['hub_file']}")
         else:
-            print(f"  ❌ Hub NOT defined (this causes the error!)")
+            lines.append(f"  ❌ Hub NOT defined (this causes the error!)")
 
-        print()
+        lines.append("")
+    sys.stdout.write('\n'.join(lines) + '\n')
 
     # Provide solutions
     print("=" * 70)
@@ -146,25 +178,28 @@ def main():
     print("=" * 70)
     print()
 
+    lines = []
     for issue in all_issues:
-        hub_defined, _ = check_hub_definition(config_dir, issue['hub_name'])
-
-        if not hub_defined:
-            print(f"To fix {issue['file']}:")
-            print()
-            print(f"  Option 1: Comment out the hub line (recommended for ACE-only)")
-            print(f"    Change line {issue['line']} from:")
-            print(f"      {issue['content']}")
-            print(f"    To:")
-            print(f"      # {issue['content']}")
-            print()
-            print(f"  Option 2: Define the hub (only if you have physical hub hardware)")
-            print(f"    Add this section to your config:")
-            print(f"      [AFC_hub {issue['hub_name']}]")
-            print(f"      # Your hub configuration here")
-            print()
-            print("-" * 70)
-            print()
+        if not issue['hub_defined']:
+            lines.extend((
+                f"To fix {issue['file']}:",
+                "",
+                f"  Option 1: Comment out the hub line (recommended for ACE-only)",
+                f"    Change line {issue['line']} from:",
+                f"      {issue['content']}",
+                f"    To:",
+                f"      # {issue['content']}",
+                "",
+                f"  Option 2: Define the hub (only if you have physical hub hardware)",
+                f"    Add this section to your config:",
+                f"      [AFC_hub {issue['hub_name']}]",
+                f"      # Your hub configuration here",
+                "",
+                "-" * 70,
+                "",
+            ))
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     print("After making changes:")
     print("  1. Save your config files")
@@ -16,7 +16,6 @@ import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from extras.AFC_ACE_discovery import AceDiscovery
-from extras.AFC_ACE_protocol import AceProtocol
 
 
 def list_devices():
@@ -38,6 +37,9 @@ def list_devices():
 
     print(f"Found {len(devices)} ACE device(s):\n")
 
+    # Probe all devices for firmware info at once
+    probed = AceDiscovery.probe_ace_devices_parallel([device['port'] for device in devices])
+
     for i, device in enumerate(devices):
         print(f"Device {i}:")
         print(f"  Port (tty):      {device.get('port_tty', 'N/A')}")
@@ -49,21 +51,16 @@ def list_devices():
         print(f"  Serial Number:   {device.get('serial_number', 'N/A')}")
         print()
 
-        # Try to probe device for firmware info
-        try:
-            protocol = AceProtocol(device['port'])
-            if protocol.connect():
-                info = protocol.get_info()
-                protocol.disconnect()
-
-                if info:
-                    print(f"  Device Info:")
-                    print(f"    Model:         {info.get('model', 'Unknown')}")
-                    print(f"    Firmware:      {info.get('firmware', 'Unknown')}")
-                    print(f"    MAC Address:   {info.get('mac_address', 'N/A')}")
-                    print()
-        except Exception as e:
-            print(f"  (Could not probe device: {e})")
+        # Show firmware info from the probe
+        info = probed[i]
+        if info:
+            print(f"  Device Info:")
+            print(f"    Model:         {info.get('model', 'Unknown')}")
+            print(f"    Firmware:      {info.get('firmware', 'Unknown')}")
+            print(f"    MAC Address:   {info.get('mac_address') or 'N/A'}")
+            print()
+        else:
+            print(f"  (Could not probe device)")
             print()
 
 
@@ -7,49 +7,154 @@ Checks the entire AFC configuration for potential issues
 import sys
 import os
 import re
-
-def scan_for_pattern(config_dir, pattern, description):
-    """Scan all config files for a pattern"""
-    results = []
-
-    for root, dirs, files in os.walk(config_dir):
-        for file in files:
-            if file.endswith('.cfg'):
-                filepath = os.path.join(root, file)
-                try:
-                    with open(filepath, 'r') as f:
-                        lines = f.readlines()
-
-                    for line_num, line in enumerate(lines, 1):
-                        if re.search(pattern, line):
-                            results.append({
-                                'file': filepath,
-                                'line': line_num,
-                                'content': line.strip()
-                            })
-                except:
-                    pass
-
-    if results:
-        print(f"\n{description}:")
-        for r in results:
-            rel_path = r['file'].replace(config_dir, '.')
-            print(f"  {rel_path}:{r['line']}")
-            print(f"    {r['content']}")
+import mmap
+import argparse
+
+from cfg_scan import iter_cfg_files, scan_cfg_files, add_cache_arguments, open_cache
+
+_UNIT_TYPES = ('AFC_ACE', 'AFC_BoxTurtle', 'AFC_NightOwl', 'AFC_HTLF')
+
+# Everything main() looks for, as one alternation so each file is scanned
+# by a single regex pass; the group that matched names the result bucket.
+# Line patterns: {bucket: option name at the start of a line}
+_LINE_KEYS = {
+    'hub_ref': 'hub',
+    'extruder_ref': 'extruder',
+}
+# Section patterns: {bucket: section type}
+_SECTION_KEYS = {
+    'hub_def': 'AFC_hub',
+    'lane': 'AFC_lane',
+    'afc_extruder': 'AFC_extruder',
+    **{unit_type: unit_type for unit_type in _UNIT_TYPES},
+}
+# [^\S\n] is whitespace that doesn't run on into the next line, and the
+# whitespace after a section type is a lookahead so it can't swallow an
+# option on the following line. Names are escaped as they're matched
+# literally, and the whole pattern is compiled once at import. Files are
+# scanned as bytes, so only the matching lines ever get decoded.
+_MASTER_RE = re.compile((
+    '|'.join(rf'(?P<{key}>^[^\S\n]*{re.escape(option)}[^\S\n]*:)' for key, option in _LINE_KEYS.items()) +
+    r'|\[(?:' + '|'.join(rf'(?P<{key}>{re.escape(section)})' for key, section in _SECTION_KEYS.items()) + r')(?=\s)'
+).encode('ascii'), re.MULTILINE)
+
+# Files at least this big are memory-mapped instead of read
+MMAP_MIN_SIZE = 64 * 1024
+
+def _scan_one(filepath):
+    """
+    Scan one config file for everything in _MASTER_RE
+    Returns {bucket: [hits]}, with at most one hit per line and bucket
+    """
+    results = {name: [] for name in _MASTER_RE.groupindex}
+
+    try:
+        with open(filepath, 'rb') as f:
+            # Large files are scanned in place rather than copied into memory
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    _find_hits(filepath, data, results)
+            else:
+                _find_hits(filepath, f.read(), results)
+    except:
+        pass
 
     return results
 
+def _find_hits(filepath, data, results):
+    """Add the _MASTER_RE hits in data (bytes or mmap) to results"""
+    for name, line_num, content in _iter_hits(data):
+        results[name].append({'file': filepath, 'line': line_num, 'content': content})
+
+def _iter_hits(data):
+    """
+    Yield (bucket, line number, line content) for each _MASTER_RE hit in
+    data (bytes or mmap), in file order
+    """
+    line_num = 1
+    pos = 0
+    last_lines = {}
+    for match in _MASTER_RE.finditer(data):
+        # Line numbers are only worked out for hits, counting on from the last
+        # one. find() searches in place; slicing an mmap would copy the bytes.
+        start = match.start()
+        newline = data.find(b'\n', pos, start)
+        while newline >= 0:
+            line_num += 1
+            newline = data.find(b'\n', newline + 1, start)
+        pos = start
+
+        name = match.lastgroup
+        if last_lines.get(name) == line_num:
+            continue
+        last_lines[name] = line_num
+
+        line_start = data.rfind(b'\n', 0, start) + 1
+        line_end = data.find(b'\n', start)
+        if line_end < 0:
+            line_end = len(data)
+        yield name, line_num, data[line_start:line_end].decode('utf-8', 'replace').strip()
+
+def scan_all(config_dir, cache=None):
+    """
+    Scan all config files once, reading each file a single time
+    Files unchanged since the last run are taken from cache, if given
+    Returns ({bucket: [hits]}, [config file os.DirEntry objects])
+    """
+    results = {name: [] for name in _MASTER_RE.groupindex}
+    cfg_entries = list(iter_cfg_files(config_dir))
+
+    for _, per_file in scan_cfg_files(_scan_one, cfg_entries, cache):
+        for name, hits in per_file.items():
+            results[name].extend(hits)
+
+    # Files finish in any order; only the (small) hit lists get sorted
+    for hits in results.values():
+        hits.sort(key=lambda hit: (hit['file'], hit['line']))
+
+    return results, cfg_entries
+
+def rel_path_start(config_dir):
+    """
+    Returns the index where a scanned file's path continues past config_dir,
+    so paths can be shown relative to it as './' + path[start:]
+    """
+    return len(os.path.join(config_dir, ''))
+
+def print_hits(config_dir, hits, description):
+    """Print the hits for one pattern, if there are any"""
+    if hits:
+        start = rel_path_start(config_dir)
+        # Build the whole section and write it in one go
+        lines = [f"\n{description}:"]
+        for r in hits:
+            rel_path = './' + r['file'][start:]
+            lines.append(f"  {rel_path}:{r['line']}")
+            lines.append(f"    {r['content']}")
+        sys.stdout.write('\n'.join(lines) + '\n')
+
 def main():
-    config_dir = os.path.expanduser("~/printer_data/config")
+    parser = argparse.ArgumentParser(description='AFC-ACE Full Diagnostic Tool')
+    parser.add_argument(
+        'config_dir',
+        nargs='?',
+        default=os.path.expanduser("~/printer_data/config"),
+        help='Klipper config directory (default: ~/printer_data/config)'
+    )
+    add_cache_arguments(parser)
+    args = parser.parse_args()
 
-    if len(sys.argv) > 1:
-        config_dir = sys.argv[1]
+    config_dir = args.config_dir
 
     print("=" * 70)
     print("AFC-ACE Full Diagnostic")
     print("=" * 70)
     print(f"\n📁 Config directory: {config_dir}\n")
 
+    # Read every config file once up front; the checks below use the results
+    cache = open_cache('diagnose_afc', _MASTER_RE.pattern.decode('ascii'), args)
+    scan, cfg_entries = scan_all(config_dir, cache)
+
     # Check 1: AFC base configuration
     print("🔍 Checking AFC base configuration...")
     afc_cfg = os.path.join(config_dir, 'AFC', 'AFC.cfg')
@@ -61,11 +166,7 @@ def main():
 
     # Check 2: ACE configuration
     print("\n🔍 Checking ACE configuration...")
-    ace_configs = []
-    for root, dirs, files in os.walk(config_dir):
-        for file in files:
-            if 'ACE' in file and file.endswith('.cfg'):
-                ace_configs.append(os.path.join(root, file))
+    ace_configs = sorted(entry.path for entry in cfg_entries if 'ACE' in entry.name)
 
     if ace_configs:
         print(f"  ✅ Found {len(ace_configs)} ACE config file(s):")
@@ -76,22 +177,16 @@ def main():
 
     # Check 3: Look for ALL hub references
     print("\n🔍 Scanning for hub references...")
-    hub_refs = scan_for_pattern(
-        config_dir,
-        r'^\s*hub\s*:',
-        "Hub references found"
-    )
+    hub_refs = scan['hub_ref']
+    print_hits(config_dir, hub_refs, "Hub references found")
 
     if not hub_refs:
         print("  ✅ No uncommented hub references")
 
     # Check 4: Look for AFC_hub definitions
     print("\n🔍 Checking for hub definitions...")
-    hub_defs = scan_for_pattern(
-        config_dir,
-        r'\[AFC_hub\s+',
-        "Hub definitions found"
-    )
+    hub_defs = scan['hub_def']
+    print_hits(config_dir, hub_defs, "Hub definitions found")
 
     if not hub_defs:
         print("  ℹ️  No AFC_hub sections defined (OK for ACE-only)")
@@ -100,12 +195,9 @@ def main():
     print("\n🔍 Checking AFC units...")
 
     units = {}
-    for unit_type in ['AFC_ACE', 'AFC_BoxTurtle', 'AFC_NightOwl', 'AFC_HTLF']:
-        unit_refs = scan_for_pattern(
-            config_dir,
-            rf'\[{unit_type}\s+',
-            f"{unit_type} units"
-        )
+    for unit_type in _UNIT_TYPES:
+        unit_refs = scan[unit_type]
+        print_hits(config_dir, unit_refs, f"{unit_type} units")
         if unit_refs:
             units[unit_type] = len(unit_refs)
 
@@ -118,11 +210,8 @@ def main():
 
     # Check 6: Look for AFC lanes
     print("\n🔍 Checking AFC lanes...")
-    lanes = scan_for_pattern(
-        config_dir,
-        r'\[AFC_lane\s+',
-        "AFC lanes found"
-    )
+    lanes = scan['lane']
+    print_hits(config_dir, lanes, "AFC lanes found")
 
     if lanes:
         print(f"  ✅ Found {len(lanes)} lane(s)")
@@ -131,11 +220,8 @@ def main():
 
     # Check 7: Look for extruder references
     print("\n🔍 Checking extruder configuration...")
-    extruders = scan_for_pattern(
-        config_dir,
-        r'^\s*extruder\s*:',
-        "Extruder references"
-    )
+    extruders = scan['extruder_ref']
+    print_hits(config_dir, extruders, "Extruder references")
 
     if extruders:
         print(f"  ✅ Found {len(extruders)} extruder reference(s)")
@@ -144,11 +230,8 @@ def main():
 
     # Check 8: Look for AFC_extruder definitions
     print("\n🔍 Checking AFC_extruder definitions...")
-    afc_extruders = scan_for_pattern(
-        config_dir,
-        r'\[AFC_extruder\s+',
-        "AFC_extruder sections"
-    )
+    afc_extruders = scan['afc_extruder']
+    print_hits(config_dir, afc_extruders, "AFC_extruder sections")
 
     if not afc_extruders:
         print("  ℹ️  No AFC_extruder sections (may be OK)")
@@ -161,9 +244,12 @@ def main():
         print("  ❌ ISSUE FOUND: Hub referenced but not defined!")
         print("     This is likely causing your error.")
         print("     Files with hub references:")
+        start = rel_path_start(config_dir)
+        lines = []
         for ref in hub_refs:
-            rel_path = ref['file'].replace(config_dir, '.')
-            print(f"       {rel_path}:{ref['line']}")
+            rel_path = './' + ref['file'][start:]
+            lines.append(f"       {rel_path}:{ref['line']}")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     # Summary
     print("\n" + "=" * 70)
@@ -175,9 +261,12 @@ def main():
         print("   You have 'hub:' references in your config but no [AFC_hub] definition.")
         print("\n   SOLUTION 1 (Recommended for ACE-only):")
         print("   Comment out ALL hub: lines in these files:")
+        start = rel_path_start(config_dir)
+        lines = []
         for ref in hub_refs:
-            rel_path = ref['file'].replace(config_dir, '.')
-            print(f"     - {rel_path}:{ref['line']}")
+            rel_path = './' + ref['file'][start:]
+            lines.append(f"     - {rel_path}:{ref['line']}")
+        sys.stdout.write('\n'.join(lines) + '\n')
         print("\n   SOLUTION 2 (Only if you have physical AFC hub):")
         print("   Add an [AFC_hub hub] section to your config")
 